@@ -0,0 +1,15 @@
+"""
+Load-test and benchmark suite.
+
+  python -m app.bench --sizes 10k --transports inproc http --modes default sqlite-production
+
+Seeds deterministic datasets (cached per size and seed), drives every endpoint
+in-process (httpx ASGI transport) and/or over HTTP (uvicorn subprocess), and
+reports p50/p95/p99 latency, throughput and peak RSS as JSON.
+"""
+
+from .datasets import PRESETS, dataset_path, ensure_dataset
+from .scenarios import SCENARIOS
+from .runner import summarize
+
+__all__ = ["PRESETS", "SCENARIOS", "dataset_path", "ensure_dataset", "summarize"]
@@ -0,0 +1,138 @@
+"""
+Benchmark CLI.
+
+Usage:
+  python -m app.bench --sizes 10k 1m --modes default sqlite-production \\
+      --transports inproc http --concurrency 16 --requests 500 --out bench.json
+  python -m app.bench --sizes 10k --baseline bench.json   # exit 1 on regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List
+
+from .datasets import PRESETS, ensure_dataset
+from .runner import run_http
+from .scenarios import ROW_LIMITS, SCENARIOS
+
+# Storage modes: environment applied to the app process.
+MODES: Dict[str, Dict[str, str]] = {
+    "default"          : {},
+    "async"            : {"DB_MODE": "async"},
+    "sqlite-production": {"SQLITE_PROFILE": "production"},
+    "group-commit"     : {"GROUP_COMMIT": "1"},
+}
+TRANSPORTS = ("inproc", "http")
+
+
+def mode_env(mode: str, db_path: str) -> Dict[str, str]:
+    env = {**os.environ, **MODES[mode], "SQLITE_PATH": db_path, "LOG_LEVEL": "WARNING"}
+    env.pop("DATABASE_URL", None)
+    return env
+
+
+def run_inproc(env: Dict[str, str], names: List[str], args) -> Dict[str, Any]:
+    out = tempfile.NamedTemporaryFile(suffix=".json", delete=False).name
+    cmd = [
+        sys.executable, "-m", "app.bench.inproc", *names, "--out", out,
+        "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+        "--seed", str(args.seed), "--warmup", str(args.warmup),
+    ]
+    subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+    with open(out) as f:
+        result = json.load(f)
+    os.remove(out)
+    return result
+
+
+def regressions(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Scenarios whose p95 grew or req/s dropped by more than `tolerance`."""
+    found = []
+    for size, modes in current.items():
+        for mode, transports in modes.items():
+            for transport, scenarios in transports.items():
+                base = baseline.get(size, {}).get(mode, {}).get(transport, {})
+                for name, now in scenarios.items():
+                    was = base.get(name)
+                    if not was:
+                        continue
+                    key = f"{size}/{mode}/{transport}/{name}"
+                    if was["p95_ms"] and now["p95_ms"] > was["p95_ms"] * (1 + tolerance):
+                        found.append(f"{key}: p95 {was['p95_ms']} -> {now['p95_ms']} ms")
+                    if now["req_per_sec"] < was["req_per_sec"] * (1 - tolerance):
+                        found.append(
+                            f"{key}: req/s {was['req_per_sec']} -> {now['req_per_sec']}"
+                        )
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the OFC API.")
+    parser.add_argument("--sizes", nargs="+", default=["10k"], choices=list(PRESETS))
+    parser.add_argument("--modes", nargs="+", default=["default"], choices=list(MODES))
+    parser.add_argument("--transports", nargs="+", default=list(TRANSPORTS), choices=TRANSPORTS)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=10, help="unreported requests first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "ofc-bench"))
+    parser.add_argument("--out", help="write the JSON report here as well as stdout")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {}
+    for size in args.sizes:
+        dataset = ensure_dataset(args.data_dir, size, args.seed)
+        names = [n for n in args.scenarios if PRESETS[size] <= ROW_LIMITS.get(n, PRESETS[size])]
+        for mode in args.modes:
+            for transport in args.transports:
+                work = os.path.join(args.data_dir, f"work-{size}-{mode}-{transport}.db")
+                shutil.copyfile(dataset, work)
+                env = mode_env(mode, work)
+                print(f"⏱️  {size} / {mode} / {transport}", file=sys.stderr)
+                run = run_inproc if transport == "inproc" else run_http
+                results.setdefault(size, {}).setdefault(mode, {})[transport] = run(env, names, args)
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(work + suffix):
+                        os.remove(work + suffix)
+
+    report = {
+        "meta"   : {
+            "time"       : datetime.utcnow().isoformat() + "Z",
+            "python"     : platform.python_version(),
+            "platform"   : platform.platform(),
+            "requests"   : args.requests,
+            "concurrency": args.concurrency,
+            "seed"       : args.seed,
+            "warmup"     : args.warmup,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f)["results"], args.max_regression)
+        for line in found:
+            print(f"❌ {line}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+        print("✅ No regressions against baseline.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
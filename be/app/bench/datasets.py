@@ -0,0 +1,65 @@
+"""Deterministic benchmark datasets, built once per (size, seed) and cached on disk."""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models import Account, Category, Transaction, DEFAULT_ACCOUNT_ID
+from app.scripts.seed_db import DEFAULT_CATEGORIES, bulk_insert, generate_transactions
+from app.storage.daily_balance_repo import DailyBalanceRepository
+
+PRESETS = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+DATASET_START = datetime(2023, 1, 1)
+DATASET_DAYS = 730
+GENERATOR_VERSION = 3  # bump when the generator's output for a seed (or the schema) changes
+
+
+def dataset_path(data_dir: str, size: str, seed: int) -> str:
+    return os.path.join(data_dir, f"transactions-{size}-seed{seed}-v{GENERATOR_VERSION}.db")
+
+
+def build_dataset(path: str, rows: int, seed: int) -> None:
+    tmp = path + ".building"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    engine = create_engine(f"sqlite:///{tmp}")
+    SQLModel.metadata.create_all(engine)
+    started = time.perf_counter()
+    with Session(engine) as session:
+        session.add(Account(id=DEFAULT_ACCOUNT_ID, name="default", created_at=DATASET_START))
+        session.add_all(Category(name=n, created_at=DATASET_START) for n in DEFAULT_CATEGORIES)
+        session.commit()
+        chunks = generate_transactions(
+            rows,
+            seed,
+            start=DATASET_START.date(),
+            days=DATASET_DAYS,
+            created_at=DATASET_START + timedelta(days=DATASET_DAYS),
+        )
+        bulk_insert(session, chunks)
+        DailyBalanceRepository(session).rebuild()
+    engine.dispose()
+    os.replace(tmp, path)
+    print(f"✅ Dataset {os.path.basename(path)}: {rows} rows in {time.perf_counter() - started:.1f}s")
+
+
+def dataset_rows(path: str) -> int:
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with Session(engine) as session:
+            return session.exec(select(func.count()).select_from(Transaction)).one()
+    finally:
+        engine.dispose()
+
+
+def ensure_dataset(data_dir: str, size: str, seed: int = 42) -> str:
+    """Path of the cached dataset for `size`, building it first if needed."""
+    os.makedirs(data_dir, exist_ok=True)
+    path = dataset_path(data_dir, size, seed)
+    if not os.path.exists(path) or dataset_rows(path) != PRESETS[size]:
+        build_dataset(path, PRESETS[size], seed)
+    return path
@@ -0,0 +1,47 @@
+"""
+In-process driver, run as a subprocess by `python -m app.bench` so each storage
+mode gets a fresh interpreter with its own env (SQLITE_PATH, DB_MODE, ...).
+
+Usage:
+  SQLITE_PATH=/tmp/work.db python -m app.bench.inproc --out result.json list create
+"""
+
+import argparse
+import asyncio
+import json
+
+import httpx
+
+from .runner import run_scenarios
+
+
+async def drive(args):
+    from app.main import app  # imported here so the caller's env is in effect
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=300
+        ) as client:
+            return await run_scenarios(
+                client, args.scenarios, args.requests, args.concurrency, args.seed,
+                warmup=args.warmup,
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run bench scenarios in-process.")
+    parser.add_argument("scenarios", nargs="+")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--warmup", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.out, "w") as f:
+        json.dump(asyncio.run(drive(args)), f)
+
+
+if __name__ == "__main__":
+    main()
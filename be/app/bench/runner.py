@@ -0,0 +1,157 @@
+"""Drive scenarios through an httpx client and summarize latency, throughput and RSS."""
+
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+from .scenarios import SCENARIOS, BenchState
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Latencies in seconds -> counts, req/s and p50/p95/p99/max in milliseconds."""
+    ordered = sorted(latencies)
+    ms = lambda v: round(v * 1000, 3)
+    return {
+        "requests"   : len(ordered),
+        "errors"     : errors,
+        "req_per_sec": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms"     : ms(percentile(ordered, 50)),
+        "p95_ms"     : ms(percentile(ordered, 95)),
+        "p99_ms"     : ms(percentile(ordered, 99)),
+        "max_ms"     : ms(ordered[-1]) if ordered else 0.0,
+    }
+
+
+def peak_rss_kb(pid: Any = "self") -> Optional[int]:
+    """High-water RSS of a process (Linux /proc), None where unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss(pid: Any = "self") -> None:
+    """Reset VmHWM so the next reading covers one scenario only (Linux >= 4.0)."""
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    requests: int,
+    concurrency: int,
+    seed: int,
+    state: Optional[BenchState] = None,
+) -> Dict[str, Any]:
+    build = SCENARIOS[name]
+    state = state or BenchState()
+    tickets = iter(range(requests))
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker(n: int):
+        nonlocal errors
+        rnd = random.Random(seed * 1000 + n)
+        for _ in tickets:
+            method, url, kwargs = build(rnd, state)
+            started = time.perf_counter()
+            try:
+                r = await client.request(method, url, **kwargs)
+                await r.aread()
+                failed = r.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_scenarios(
+    client: httpx.AsyncClient,
+    names: Iterable[str],
+    requests: int,
+    concurrency: int,
+    seed: int,
+    rss_pid: Any = "self",
+    warmup: int = 10,
+) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name in names:
+        state = BenchState()
+        if warmup:  # fill caches and pools; not reported
+            await run_scenario(
+                client, name, warmup, min(warmup, concurrency), seed + 1, state
+            )
+        reset_peak_rss(rss_pid)
+        results[name] = await run_scenario(client, name, requests, concurrency, seed, state)
+        results[name]["peak_rss_kb"] = peak_rss_kb(rss_pid)
+    return results
+
+
+def wait_ready(base_url: str, proc: subprocess.Popen, timeout: float = 120) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with {proc.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("uvicorn did not become ready")
+
+
+def run_http(
+    env: Dict[str, str], names: List[str], args, log_path: str = os.devnull
+) -> Dict[str, Dict[str, Any]]:
+    """Start uvicorn with `env`, drive `names` over TCP, stop it."""
+    base_url = f"http://127.0.0.1:{args.port}"
+    with open(log_path, "wb") as out:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+             "--log-level", "warning", "--no-access-log"],
+            env=env,
+            stdout=out,
+            stderr=subprocess.STDOUT,
+        )
+        try:
+            wait_ready(base_url, proc)
+            limits = httpx.Limits(max_connections=args.concurrency)
+            client = httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits)
+
+            async def drive():
+                async with client:
+                    return await run_scenarios(
+                        client, names, args.requests, args.concurrency, args.seed,
+                        proc.pid, args.warmup,
+                    )
+
+            return asyncio.run(drive())
+        finally:
+            proc.terminate()
+            proc.wait(timeout=60)
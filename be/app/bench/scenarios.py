@@ -0,0 +1,85 @@
+"""Endpoint scenarios: each builds one request from a seeded RNG and shared state."""
+
+import itertools
+import random
+from datetime import timedelta
+from typing import Any, Callable, Dict, Tuple
+
+from app.scripts.seed_db import DEFAULT_CATEGORIES
+from .datasets import DATASET_DAYS, DATASET_START
+
+Request = Tuple[str, str, Dict[str, Any]]
+
+
+class BenchState:
+    """Shared by all workers of one scenario run."""
+
+    def __init__(self):
+        # Dataset ids start at 1 and are dense, so deletes walk them in order.
+        self.delete_ids = itertools.count(1)
+
+
+def _window(rnd: random.Random, days: int = 30) -> Dict[str, str]:
+    start = DATASET_START + timedelta(days=rnd.randrange(DATASET_DAYS - days))
+    return {"start": start.isoformat(), "end": (start + timedelta(days=days)).isoformat()}
+
+
+def list_page(rnd, state) -> Request:
+    return "GET", "/transactions", {"params": {"limit": 100, "total": "false"}}
+
+
+def list_with_total(rnd, state) -> Request:
+    return "GET", "/transactions", {"params": {"limit": 100}}
+
+
+def list_filtered(rnd, state) -> Request:
+    params = {"category": rnd.choice(DEFAULT_CATEGORIES), "limit": 100, **_window(rnd)}
+    return "GET", "/transactions", {"params": params}
+
+
+def create(rnd, state) -> Request:
+    occurred_at = DATASET_START + timedelta(minutes=rnd.randrange(DATASET_DAYS * 24 * 60))
+    body = {
+        "amount"     : round(rnd.uniform(5, 500), 2),
+        "txn_type"   : rnd.choice(["credit", "debit"]),
+        "description": "bench",
+        "category"   : rnd.choice(DEFAULT_CATEGORIES),
+        "occurred_at": occurred_at.isoformat(),
+    }
+    return "POST", "/transactions", {"json": body}
+
+
+def delete(rnd, state) -> Request:
+    return "DELETE", f"/transactions/{next(state.delete_ids)}", {}
+
+
+def balance_daily(rnd, state) -> Request:
+    return "GET", "/stats/balance_over_time", {"params": {"granularity": "day"}}
+
+
+def balance_window(rnd, state) -> Request:
+    return "GET", "/stats/balance_over_time", {"params": _window(rnd, 7)}
+
+
+def categories(rnd, state) -> Request:
+    return "GET", "/categories", {}
+
+
+def dump_db(rnd, state) -> Request:
+    return "GET", "/dump-db", {}
+
+
+SCENARIOS: Dict[str, Callable[[random.Random, BenchState], Request]] = {
+    "list"          : list_page,
+    "list_total"    : list_with_total,
+    "list_filtered" : list_filtered,
+    "create"        : create,
+    "delete"        : delete,
+    "balance_daily" : balance_daily,
+    "balance_window": balance_window,
+    "categories"    : categories,
+    "dump_db"       : dump_db,
+}
+
+# Scenarios too heavy to run on big datasets: name -> max dataset rows.
+ROW_LIMITS = {"dump_db": 1_000_000}
@@ -1,4 +1,4 @@
-from typing import Any, Generator
+from typing import Any, AsyncGenerator, Generator, List, Optional
 
 from sqlmodel import SQLModel, create_engine
 from sqlmodel import Session as SqlSession
@@ -6,6 +6,8 @@ import os
 from logging import getLogger
 
 from sqlmodel import SQLModel, select
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import make_url
 
 logger = getLogger(__name__)
 
@@ -13,22 +15,276 @@ DEFAULT_SQLITE_PATH = os.path.join(".", "data", "transactions.db")
 DATABASE_URL = os.getenv(
     "DATABASE_URL", f"sqlite:///{os.getenv('SQLITE_PATH', DEFAULT_SQLITE_PATH)}"
 )
+if DATABASE_URL.startswith("postgres://"):  # Heroku / Cloud SQL style URLs
+    DATABASE_URL = "postgresql://" + DATABASE_URL[len("postgres://"):]
 if DATABASE_URL.startswith("sqlite:///"):
     db_file = DATABASE_URL.replace("sqlite:///", "", 1)
     os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
 print(f"📄 SQLite file: {os.path.abspath(DEFAULT_SQLITE_PATH)}")
-print(f"<UNK>  DB URL: {db_file}")
+print(f"🗄️  DB URL: {make_url(DATABASE_URL).render_as_string(hide_password=True)}")
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args)
+# DB_MODE=async serves requests through an async engine (aiosqlite / asyncpg);
+# the sync engine is still used for startup, scripts and streaming export.
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+ASYNC_DB = DB_MODE == "async"
+
+# SQLITE_PROFILE=production: WAL + tuned pragmas, a pool of read-only
+# connections for GETs, and a single writer thread that group-commits writes.
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "default").lower()
+SQLITE_PRODUCTION = IS_SQLITE and SQLITE_PROFILE == "production"
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", -64 * 1024))  # KiB when < 0
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_READ_POOL = int(os.getenv("SQLITE_READ_POOL", 8))
+
+# Pool sizing. Keep DB_POOL_SIZE + DB_MAX_OVERFLOW times the instance count
+# under the server's max_connections when running several Cloud Run instances.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds, -1 disables
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))  # Postgres; 0 = off
+
+
+def pool_options(
+    pool_size: Optional[int] = None, max_overflow: Optional[int] = None, async_: bool = False
+) -> dict:
+    """Engine kwargs for a timed QueuePool sized from the DB_POOL_* settings."""
+    from app.storage.pool import TimedAsyncQueuePool, TimedQueuePool
+
+    return {
+        "poolclass"    : TimedAsyncQueuePool if async_ else TimedQueuePool,
+        "pool_size"    : DB_POOL_SIZE if pool_size is None else pool_size,
+        "max_overflow" : DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+        "pool_timeout" : DB_POOL_TIMEOUT,
+        "pool_recycle" : DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def driver_connect_args(async_: bool = False) -> dict:
+    if IS_SQLITE:
+        return {"check_same_thread": False} if not async_ else {}
+    if not DB_STATEMENT_TIMEOUT_MS:
+        return {}
+    if async_:  # asyncpg
+        return {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+    return {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}  # psycopg2
+
+
+# In-memory SQLite keeps its single-connection pool; everything else is pooled.
+POOLED = DATABASE_URL not in ("sqlite://", "sqlite:///:memory:")
+connect_args = driver_connect_args()
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    connect_args=connect_args,
+    **(pool_options() if POOLED else {}),
+)
+
+
+def sqlite_pragmas(read_only: bool = False) -> List[str]:
+    pragmas = [
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size={SQLITE_CACHE_SIZE}",
+    ]
+    # journal_mode is persistent in the file; only a writable connection can set it.
+    return pragmas + (["PRAGMA query_only=1"] if read_only else ["PRAGMA journal_mode=WAL"])
+
+
+def apply_sqlite_pragmas(target, read_only: bool = False) -> None:
+    @event.listens_for(target, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in sqlite_pragmas(read_only):
+            cursor.execute(pragma)
+        cursor.close()
+
+
+read_engine = engine
+writer = None
+if SQLITE_PRODUCTION:
+    from app.storage.writer import SqliteWriter
+
+    apply_sqlite_pragmas(engine)
+    sqlite_file = os.path.abspath(DATABASE_URL.replace("sqlite:///", "", 1))
+    read_engine = create_engine(
+        f"sqlite:///file:{sqlite_file}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+        **pool_options(SQLITE_READ_POOL, 0),
+    )
+    apply_sqlite_pragmas(read_engine, read_only=True)
+
+    # One connection, autocommit at the driver level so SQLAlchemy controls
+    # BEGIN / SAVEPOINT itself (pysqlite's implicit transactions break them).
+    write_engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        **pool_options(1, 0),
+    )
+    apply_sqlite_pragmas(write_engine)
+
+    @event.listens_for(write_engine, "connect")
+    def _writer_autocommit(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(write_engine, "begin")
+    def _writer_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    writer = SqliteWriter(write_engine)
+
+
+def async_url(url: str) -> str:
+    """Swap the sync driver in `url` for its asyncio counterpart."""
+    scheme, rest = url.split("://", 1)
+    base = scheme.split("+", 1)[0]
+    driver = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "postgres": "asyncpg"}
+    if base not in driver:
+        raise ValueError(f"No async driver known for [{scheme}]")
+    return f"{'postgresql' if base == 'postgres' else base}+{driver[base]}://{rest}"
+
+
+async_engine = None
+if ASYNC_DB:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_engine = create_async_engine(
+        async_url(DATABASE_URL),
+        echo=False,
+        connect_args=driver_connect_args(async_=True),
+        **(pool_options(async_=True) if POOLED else {}),
+    )
+    if SQLITE_PRODUCTION:
+        apply_sqlite_pragmas(async_engine.sync_engine)
+
+
+def pool_engines() -> dict:
+    """Every engine this process talks to, keyed by role, for pool metrics."""
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        engines["read"] = read_engine
+    if writer is not None:
+        engines["writer"] = writer.engine
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    return engines
+
+
+# Tables derived from the ledger (rebuilt at startup when empty): recreated
+# rather than migrated when their primary key changes.
+DERIVED_TABLES = {"dailybalance"}
+
+# Indexes replaced by account-leading ones; dropped from older databases.
+RETIRED_INDEXES = (
+    "ix_transaction_category",
+    "ix_transaction_occurred_at_id",
+    "ix_transaction_category_occurred_at",
+    "ix_transaction_txn_type_occurred_at",
+    "ix_transaction_content_hash",
+)
 
 
 def init_db():
-    from app.models import Transaction, Category
+    from app.models import Account, Transaction, Category, DailyBalance
 
-    u = DATABASE_URL
+    u = make_url(DATABASE_URL).render_as_string(hide_password=True)
     logger.warn(f"database: {u}")
+    ensure_primary_keys()
     SQLModel.metadata.create_all(engine)
+    ensure_columns()
+    ensure_indexes()
+    ensure_search_index()
+    ensure_default_account()
+
+
+def ensure_primary_keys():
+    """Drop derived tables whose primary key no longer matches the model.
+
+    create_all() then recreates them and the startup rebuild refills them
+    from the ledger (e.g. DailyBalance keyed by day -> by account and day).
+    """
+    insp = inspect(engine)
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in DERIVED_TABLES or not insp.has_table(table.name):
+            continue
+        existing = insp.get_pk_constraint(table.name)["constrained_columns"]
+        if existing != [c.name for c in table.primary_key.columns]:
+            logger.warning(f"database: recreating {table.name} for its new primary key")
+            table.drop(engine)
+
+
+def ensure_columns():
+    """Add model columns missing from existing tables.
+
+    Like ensure_indexes(), this lets databases created by an older release
+    pick up new columns without a migration tool: nullable ones, and NOT NULL
+    ones that carry a server default to fill existing rows.
+    """
+    insp = inspect(engine)
+    ddl = engine.dialect.ddl_compiler(engine.dialect, None)
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in existing:
+                    continue
+                col_type = col.type.compile(dialect=engine.dialect)
+                if not col.nullable:
+                    if col.server_default is None:
+                        continue
+                    col_type += f" NOT NULL DEFAULT {ddl.get_column_default_string(col)}"
+                logger.warning(f"database: adding column {table.name}.{col.name}")
+                conn.execute(
+                    text(f'ALTER TABLE "{table.name}" ADD COLUMN "{col.name}" {col_type}')
+                )
+
+
+def ensure_indexes():
+    """Create any model index missing from an existing database.
+
+    create_all() skips tables that already exist, including their indexes,
+    so databases created before an index was declared would never get it.
+    Indexes listed in RETIRED_INDEXES are dropped.
+    """
+    with engine.begin() as conn:
+        for name in RETIRED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def ensure_default_account():
+    """Create the DEFAULT_ACCOUNT_ID account that unscoped requests and older rows use."""
+    from app.models import Account, DEFAULT_ACCOUNT_ID
+
+    with SqlSession(engine) as session:
+        if session.get(Account, DEFAULT_ACCOUNT_ID) is None:
+            session.add(Account(id=DEFAULT_ACCOUNT_ID, name="default"))
+            session.commit()
+            if engine.dialect.name == "postgresql":
+                # An explicit id does not advance the serial sequence.
+                session.exec(
+                    text(
+                        "SELECT setval(pg_get_serial_sequence('account', 'id'), "
+                        "(SELECT max(id) FROM account))"
+                    )
+                )
+                session.commit()
+
+
+def ensure_search_index():
+    """Create the description full-text index, rebuilding it when it may be stale."""
+    from app.storage import search_index
+
+    with engine.begin() as conn:
+        if search_index.ensure(conn):
+            logger.warning("database: rebuilt full-text search index")
 
 
 def get_session() -> Generator[SqlSession, Any, None]:
@@ -40,3 +296,29 @@ def get_session() -> Generator[SqlSession, Any, None]:
 
 def open_session() -> SqlSession:
     return SqlSession(engine)
+
+
+def get_read_session() -> Generator[SqlSession, Any, None]:
+    with SqlSession(read_engine) as session:
+        yield session
+
+
+def get_writer():
+    return writer
+
+
+async def get_async_session() -> AsyncGenerator[Any, None]:
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    # expire_on_commit=False: returned rows are read after run_sync() returns,
+    # where an expired attribute could not be lazily reloaded.
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+# Session dependencies for request handlers, per DB_MODE / SQLITE_PROFILE.
+# Handlers that only read ask for get_db_read_session; writers ask for
+# get_db_write_session, which is the single writer thread in production SQLite.
+get_db_session = get_async_session if ASYNC_DB else get_session
+get_db_read_session = get_async_session if ASYNC_DB else get_read_session
+get_db_write_session = get_writer if SQLITE_PRODUCTION else get_db_session
@@ -4,3 +4,23 @@ from enum import Enum
 class TxType(str, Enum):
     credit = "credit"
     debit = "debit"
+
+
+class Granularity(str, Enum):
+    raw = "raw"
+    hour = "hour"
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+    arrow = "arrow"
+    parquet = "parquet"
+
+
+class ListOrder(str, Enum):
+    time = "time"
+    relevance = "relevance"
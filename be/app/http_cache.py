@@ -0,0 +1,63 @@
+"""
+Conditional GET for read endpoints polled by the dashboard.
+
+The ETag is a hash of the requested account's data version (bumped after
+every committed write to it, see app.services.data_version), the path and the
+sorted query string. The guard runs as a route dependency ahead of the
+session dependency, so a matching If-None-Match answers 304 without opening a
+session, querying or serializing anything. With DATA_VERSION=db the version
+is read from the database (one primary-key lookup, in the threadpool), so a
+write through any process or instance changes the ETag.
+
+Env:
+  HTTP_CACHE_MAX_AGE  seconds clients may reuse a response without asking
+                      (default 0: "no-cache", i.e. always revalidate)
+"""
+
+import hashlib
+import os
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.models import DEFAULT_ACCOUNT_ID
+from app.services.data_version import data_version
+
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+CACHE_CONTROL = (
+    f"private, max-age={HTTP_CACHE_MAX_AGE}" if HTTP_CACHE_MAX_AGE > 0 else "private, no-cache"
+)
+
+
+def request_account(request: Request) -> int:
+    """account_id query parameter, as the route's account dependency will read it."""
+    try:
+        return int(request.query_params.get("account_id", DEFAULT_ACCOUNT_ID))
+    except ValueError:
+        return DEFAULT_ACCOUNT_ID
+
+
+def etag_for(request: Request) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    key = f"{data_version.token(request_account(request))}|{request.url.path}|{query}"
+    return '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def conditional_get(request: Request, response: Response) -> None:
+    """Route dependency: 304 when If-None-Match still matches, else tag the response."""
+    etag = await run_in_threadpool(etag_for, request) if data_version.shared else etag_for(request)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
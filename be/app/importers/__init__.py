@@ -0,0 +1,9 @@
+from .csv_source import CsvMapping, read_csv
+from .ofx_source import read_ofx
+
+FORMATS = ("csv", "ofx")
+
+
+def detect_format(filename: str) -> str:
+    """Guess the statement format from a file name; CSV unless .ofx/.qfx."""
+    return "ofx" if filename.lower().endswith((".ofx", ".qfx")) else "csv"
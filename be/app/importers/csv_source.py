@@ -0,0 +1,88 @@
+import csv
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+
+from pydantic import BaseModel, Field
+
+_NOT_NUMERIC = re.compile(r"[^\d.\-]")
+
+
+class CsvMapping(BaseModel):
+    """Which CSV header holds each transaction field."""
+
+    date: str = "date"
+    amount: Optional[str] = Field(
+        "amount", description="signed amount; negative means debit"
+    )
+    description: str = "description"
+    category: Optional[str] = None
+    txn_type: Optional[str] = Field(None, description="credit/debit column, if any")
+    credit: Optional[str] = Field(None, description="separate credit amount column")
+    debit: Optional[str] = Field(None, description="separate debit amount column")
+    date_format: Optional[str] = Field(
+        None, description="strptime format; ISO 8601 when omitted"
+    )
+    delimiter: str = ","
+
+
+def parse_amount(raw: str) -> Optional[float]:
+    """Parse '$1,234.50', '(12.00)' or '-3' style amounts; blank -> None."""
+    raw = (raw or "").strip()
+    if not raw:
+        return None
+    negative = raw.startswith("(") and raw.endswith(")")
+    value = float(_NOT_NUMERIC.sub("", raw))
+    return -abs(value) if negative else value
+
+
+def _column(row: Dict[str, str], name: str) -> str:
+    if name not in row:
+        raise ValueError(f"Missing column: [{name}]")
+    return row[name] or ""
+
+
+def _record(row: Dict[str, str], m: CsvMapping) -> Dict[str, Any]:
+    raw_date = _column(row, m.date).strip()
+    occurred_at = (
+        datetime.strptime(raw_date, m.date_format)
+        if m.date_format
+        else datetime.fromisoformat(raw_date)
+    )
+
+    if m.credit or m.debit:
+        credit = parse_amount(_column(row, m.credit)) if m.credit else None
+        debit = parse_amount(_column(row, m.debit)) if m.debit else None
+        if credit:
+            amount, txn_type = abs(credit), "credit"
+        elif debit:
+            amount, txn_type = abs(debit), "debit"
+        else:
+            raise ValueError("No credit or debit amount")
+    else:
+        amount = parse_amount(_column(row, m.amount or "amount"))
+        if amount is None:
+            raise ValueError("Missing amount")
+        if m.txn_type:
+            txn_type = _column(row, m.txn_type)
+        else:
+            txn_type = "debit" if amount < 0 else "credit"
+        amount = abs(amount)
+
+    return {
+        "amount"     : amount,
+        "txn_type"   : txn_type,
+        "description": _column(row, m.description).strip(),
+        "category"   : (_column(row, m.category).strip() or None) if m.category else None,
+        "occurred_at": occurred_at,
+    }
+
+
+def read_csv(stream: TextIO, mapping: CsvMapping) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, record dict or ValueError), one row at a time."""
+    reader = csv.DictReader(stream, delimiter=mapping.delimiter)
+    for row in reader:
+        try:
+            yield reader.line_num, _record(row, mapping)
+        except ValueError as e:
+            yield reader.line_num, e
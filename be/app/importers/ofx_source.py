@@ -0,0 +1,70 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterator, TextIO, Tuple
+
+_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+READ_SIZE = 64 * 1024
+
+
+def parse_ofx_date(raw: str) -> datetime:
+    """OFX dates are YYYYMMDD[HHMMSS[.XXX]][tz]; the timezone is dropped."""
+    digits = re.match(r"\d+", raw.strip())
+    if not digits or len(digits.group()) < 8:
+        raise ValueError(f"Invalid OFX date: [{raw}]")
+    d = digits.group()[:14]
+    fmt = {8: "%Y%m%d", 12: "%Y%m%d%H%M", 14: "%Y%m%d%H%M%S"}.get(len(d))
+    if not fmt:
+        raise ValueError(f"Invalid OFX date: [{raw}]")
+    return datetime.strptime(d, fmt)
+
+
+def _record(fields: Dict[str, str]) -> Dict[str, Any]:
+    if "TRNAMT" not in fields or "DTPOSTED" not in fields:
+        raise ValueError("STMTTRN without TRNAMT/DTPOSTED")
+    amount = float(fields["TRNAMT"].replace(",", "."))
+    parts = [fields.get("NAME", ""), fields.get("MEMO", "")]
+    description = " - ".join(dict.fromkeys(p for p in parts if p))
+    return {
+        "amount"     : abs(amount),
+        "txn_type"   : "debit" if amount < 0 else "credit",
+        "description": description,
+        "occurred_at": parse_ofx_date(fields["DTPOSTED"]),
+    }
+
+
+def _tags(stream: TextIO) -> Iterator[Tuple[bool, str, str]]:
+    """(closing, TAG, value) for each tag, reading READ_SIZE chars at a time."""
+    buf = ""
+    while True:
+        chunk = stream.read(READ_SIZE)
+        buf += chunk
+        # Only parse up to the last '<': the tag after it may be incomplete.
+        cut = len(buf) if not chunk else buf.rfind("<")
+        if cut > 0:
+            for m in _TAG.finditer(buf, 0, cut):
+                yield m.group(1) == "/", m.group(2).upper(), m.group(3).strip()
+            buf = buf[cut:]
+        if not chunk:
+            return
+
+
+def read_ofx(stream: TextIO) -> Iterator[Tuple[int, Any]]:
+    """Yield (n-th STMTTRN, record dict or ValueError) from an OFX/QFX file.
+
+    Handles both SGML (OFX 1.x, unclosed leaf tags) and XML (OFX 2.x) bodies.
+    """
+    index = 0
+    fields = None
+    for closing, tag, value in _tags(stream):
+        if tag == "STMTTRN":
+            if closing and fields is not None:
+                index += 1
+                try:
+                    yield index, _record(fields)
+                except ValueError as e:
+                    yield index, e
+                fields = None
+            elif not closing:
+                fields = {}
+        elif fields is not None and not closing and value:
+            fields[tag] = value
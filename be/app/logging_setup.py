@@ -0,0 +1,107 @@
+"""
+Process logging configuration, driven by environment variables:
+
+  LOG_FORMAT   text (default) | json    one JSON object per line in json mode
+  LOG_LEVEL    root level, default INFO
+  LOG_LEVELS   per-logger overrides, e.g. "ofc.routers=DEBUG,sqlalchemy.engine=INFO"
+  LOG_QUEUE    1 (default) | 0          hand records to a background thread
+
+With LOG_QUEUE on, request code only formats the record and puts it on an
+in-memory queue; a QueueListener thread does the stdout writes, so slow or
+blocked stdout never stalls a request.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
+
+# Attributes every LogRecord has; anything else came in through `extra=`.
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts"    : datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level" : record.levelname,
+            "logger": record.name,
+            "msg"   : record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TracebackQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that hands the traceback to the listener's formatter.
+
+    The stdlib prepare() formats the whole record into `msg` and clears
+    exc_info, so the listener's formatter never sees the exception (the JSON
+    "exc" field stayed empty). Here only the message is merged; the traceback
+    is rendered to text (tracebacks cannot be pickled or outlive the frame)
+    and kept in exc_text, which both formatters output.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """`"a=DEBUG,b.c=warning"` -> {"a": "DEBUG", "b.c": "WARNING"}."""
+    levels = {}
+    for item in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging() -> None:
+    global _listener
+    fmt = os.getenv("LOG_FORMAT", "text").lower()
+    use_queue = os.getenv("LOG_QUEUE", "1").lower() in ("1", "true", "yes")
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    if use_queue:
+        q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        root.addHandler(TracebackQueueHandler(q))
+        _listener = logging.handlers.QueueListener(q, stream, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    else:
+        root.addHandler(stream)
+
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    for name, level in parse_levels(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
@@ -3,20 +3,41 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from sqlmodel import SQLModel
 
-from app.routers import transactions_router, stats_router, categories_router
-from app.database import engine, init_db, open_session
+from app.routers import (
+    accounts_router,
+    transactions_router,
+    stats_router,
+    categories_router,
+    imports_router,
+    export_router,
+    metrics_router,
+)
+from app.database import (
+    engine,
+    ensure_default_account,
+    ensure_search_index,
+    init_db,
+    open_session,
+    pool_engines,
+    writer,
+)
+from app import metrics
 from app import models  # ensure models are registered with SQLModel metadata
 from app.scripts.seed_db import seed_categories, seed_transactions
+from app.storage.daily_balance_repo import DailyBalanceRepository
+from app.services.accounts_service import known_accounts
+from app.services.category_cache import category_cache
+from app.services.data_version import data_version
+from app.services.result_cache import result_cache
+from app.services.group_commit import transaction_batcher
 
-import logging, sys, os
+from app.logging_setup import configure_logging
+
+import logging, os
 from datetime import datetime
 
-# --- Logging setup ---
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
+# --- Logging setup (LOG_FORMAT / LOG_LEVEL / LOG_LEVELS / LOG_QUEUE) ---
+configure_logging()
 logger = logging.getLogger("ofc")
 
 
@@ -25,12 +46,25 @@ logger = logging.getLogger("ofc")
 async def lifespan(app: FastAPI):
     logger.info("startup:init_db (via lifespan)")
     init_db()
+    with open_session() as session:
+        if DailyBalanceRepository(session).rebuild_if_empty():
+            logger.info("startup:daily balance rollup backfilled")
+        category_cache.warm(session)
     yield
+    if transaction_batcher is not None:
+        await transaction_batcher.close()
+    if writer is not None:
+        writer.close()
     logger.info("shutdown:cleanup complete (via lifespan)")
 
 
 # --- App instance ---
-app = FastAPI(title="OFC Transactions API", version="3.4.0", lifespan=lifespan)
+app = FastAPI(
+    title="OFC Transactions API",
+    version="3.4.0",
+    lifespan=lifespan,
+    default_response_class=metrics.TimedJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -38,11 +72,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# --- Metrics (GET /metrics) ---
+metrics.install(app, pool_engines().values())
+
+app.include_router(accounts_router.router)
 app.include_router(transactions_router.router)
 app.include_router(stats_router.router)
 app.include_router(categories_router.router)
+app.include_router(imports_router.router)
+app.include_router(export_router.router)
+app.include_router(metrics_router.router)
 
 BUILD_TIME = os.getenv("BUILD_TIME", "unknown")
 
@@ -84,9 +126,19 @@ def reset_db():
 
     logger.warning("⚠️  /reset-db called: dropping, recreating, and seeding database.")
 
-    # Drop & recreate schema
-    SQLModel.metadata.drop_all(engine)
+    # Drop & recreate schema. DataRevision survives: restarting its counters
+    # would let ETags handed out before the reset match again.
+    SQLModel.metadata.drop_all(
+        engine,
+        tables=[t for t in SQLModel.metadata.sorted_tables if t.name != models.DataRevision.__tablename__],
+    )
     SQLModel.metadata.create_all(engine)
+    ensure_search_index()
+    ensure_default_account()
+    known_accounts.clear()
+    category_cache.invalidate()
+    result_cache.clear()
+    data_version.bump()
     logger.info("✅ Tables recreated successfully.")
 
 
@@ -102,15 +154,18 @@ def seed(rows: int = Query(50, ge=1, le=10000)):
     with open_session() as session:
         cats = seed_db.seed_categories(session)
         seed_db.seed_transactions(session, cats, rows)
+    result_cache.clear()
+    data_version.bump()
 
     # Optional: quick summary
     try:
+        from sqlalchemy import func
         from sqlmodel import select
         from app.models import Category, Transaction
 
         with open_session() as session:
-            cat_count = session.exec(select(Category)).count()
-            txn_count = session.exec(select(Transaction)).count()
+            cat_count = session.exec(select(func.count()).select_from(Category)).one()
+            txn_count = session.exec(select(func.count()).select_from(Transaction)).one()
     except Exception as e:
         logger.error(f"Error in seeding database: {e}")
         cat_count = txn_count = None
@@ -136,7 +191,8 @@ def dump_db():
     """
     Return a full JSON dump of all database contents, human-readable (pretty-printed).
     Includes Category and Transaction tables.
-    DEMO ONLY — not for production.
+    DEMO ONLY — not for production; builds the whole dump in memory.
+    Use /export to stream large ledgers.
     """
     from sqlmodel import select
     from app.models import Category, Transaction
@@ -0,0 +1,298 @@
+"""
+In-process Prometheus metrics: HTTP latency per route, SQL timing and row
+counts per statement kind, and response serialization time.
+
+Everything is recorded into fixed-bucket histograms guarded by one lock each
+(a bisect and three adds per observation) and rendered in the Prometheus text
+exposition format by GET /metrics. Values are per process; with several
+uvicorn workers each worker reports its own series.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # labels -> [count per bucket (last one is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(k, list(v[0]), v[1], v[2]) for k, v in self._series.items()]
+        for labels, counts, total, n in sorted(snapshot):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, c in zip((*self.buckets, "+Inf"), counts):
+                cumulative += c
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {total}")
+            lines.append(f"{self.name}_count{{{base}}} {n}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+HTTP_LATENCY = Histogram(
+    "ofc_http_request_duration_seconds",
+    "Time from request start to the last response byte.",
+    ("method", "route", "status"),
+)
+SERIALIZATION = Histogram(
+    "ofc_http_serialization_seconds",
+    "Time spent validating (model) and encoding (render) response bodies.",
+    ("route", "stage"),
+)
+DB_LATENCY = Histogram(
+    "ofc_db_query_duration_seconds",
+    "Time in the DB driver per statement, by operation and main table.",
+    ("operation", "table"),
+)
+DB_ROWS = Histogram(
+    "ofc_db_query_rows",
+    "Driver-reported rows per statement: affected by INSERT/UPDATE/DELETE, "
+    "returned by SELECT where the driver knows it up front (not SQLite).",
+    ("operation", "table"),
+    ROW_BUCKETS,
+)
+REGISTRY = [HTTP_LATENCY, SERIALIZATION, DB_LATENCY, DB_ROWS]
+
+_current_scope: ContextVar[Optional[dict]] = ContextVar("ofc_metrics_scope", default=None)
+
+
+def _route_label(scope: Optional[dict]) -> str:
+    route = scope.get("route") if scope else None
+    # Unmatched paths share one label so 404 scans cannot blow up cardinality.
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each HTTP request, labelled by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        status = ["500"]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_scope.reset(token)
+            HTTP_LATENCY.observe(
+                time.perf_counter() - started, scope["method"], _route_label(scope), status[0]
+            )
+
+
+class TimedJSONResponse(JSONResponse):
+    """Default response class; records how long encoding the body takes."""
+
+    def render(self, content) -> bytes:
+        started = time.perf_counter()
+        body = self.encode(content)
+        SERIALIZATION.observe(
+            time.perf_counter() - started, _route_label(_current_scope.get()), "render"
+        )
+        return body
+
+    def encode(self, content) -> bytes:
+        return super().render(content)
+
+
+_MODEL_SECONDS = "ofc.model_seconds"
+
+
+class _TimedResponseField:
+    """A route's response ModelField, timing validate() + serialize() as one "model" stage.
+
+    FastAPI may validate in the threadpool (sync endpoints) and serialize on
+    the event loop; the partial time is carried in the request scope, which
+    both see through _current_scope.
+    """
+
+    def __init__(self, field):
+        self._field = field
+
+    def __getattr__(self, name: str):
+        return getattr(self._field, name)
+
+    def validate(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._field.validate(*args, **kwargs)
+        finally:
+            scope = _current_scope.get()
+            if scope is not None:
+                scope[_MODEL_SECONDS] = time.perf_counter() - started
+
+    def serialize(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._field.serialize(*args, **kwargs)
+        finally:
+            scope = _current_scope.get()
+            spent = time.perf_counter() - started
+            if scope is not None:
+                spent += scope.pop(_MODEL_SECONDS, 0.0)
+            SERIALIZATION.observe(spent, _route_label(scope), "model")
+
+
+class TimedRoute(APIRoute):
+    """APIRoute recording response_model validation time (route_class= of every router)."""
+
+    def get_route_handler(self):
+        field = self.secure_cloned_response_field
+        if field is not None and not isinstance(field, _TimedResponseField):
+            self.secure_cloned_response_field = _TimedResponseField(field)
+        return super().get_route_handler()
+
+
+_STATEMENT = re.compile(
+    r"^\s*(?:WITH\b.*?\)\s*)?(?P<op>SELECT|INSERT|UPDATE|DELETE|PRAGMA|BEGIN|COMMIT|"
+    r"ROLLBACK|SAVEPOINT|RELEASE|CREATE|ALTER|DROP|EXPLAIN)\b"
+    r"(?:.*?\b(?:FROM|INTO|UPDATE)\s+\"?(?P<table>\w+))?",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@lru_cache(maxsize=2048)
+def statement_labels(statement: str) -> Tuple[str, str]:
+    """(operation, main table) for a SQL string; cached, statements repeat."""
+    m = _STATEMENT.match(statement)
+    if not m:
+        return "other", "-"
+    return m.group("op").lower(), (m.group("table") or "-").lower()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("ofc_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["ofc_query_start"].pop()
+    op, table = statement_labels(statement)
+    DB_LATENCY.observe(elapsed, op, table)
+    # rowcount is free (no fetching); it is -1 where the driver cannot know
+    # yet, e.g. SQLite SELECTs, which are then simply not counted.
+    if op in ("select", "insert", "update", "delete") and cursor.rowcount >= 0:
+        DB_ROWS.observe(cursor.rowcount, op, table)
+
+
+def _handle_error(context):
+    starts = context.connection.info.get("ofc_query_start") if context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def install(app, engines) -> None:
+    """Wire HTTP and SQL instrumentation into `app` and `engines`.
+
+    Serialization is timed by TimedJSONResponse (render) and TimedRoute (model).
+    """
+    app.add_middleware(MetricsMiddleware)
+    for engine in engines:
+        instrument_engine(engine)
+
+
+POOL_GAUGES = {
+    "in_use"            : ("ofc_db_pool_in_use", "gauge", "Connections checked out."),
+    "idle"              : ("ofc_db_pool_idle", "gauge", "Connections idle in the pool."),
+    "overflow"          : ("ofc_db_pool_overflow", "gauge", "Connections open beyond pool size."),
+    "checkouts"         : ("ofc_db_pool_checkouts_total", "counter", "Pool checkouts."),
+    "timeouts"          : ("ofc_db_pool_timeouts_total", "counter", "Checkouts that timed out."),
+    "wait_seconds_total": (
+        "ofc_db_pool_wait_seconds_total", "counter", "Time spent waiting for a connection."
+    ),
+}
+
+
+def pool_lines(snapshots: Dict[str, dict]) -> List[str]:
+    """Prometheus lines for app.storage.pool.pool_snapshot() results, by engine role."""
+    lines: List[str] = []
+    for key, (name, kind, help) in POOL_GAUGES.items():
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+        for role, snap in snapshots.items():
+            if key in snap:
+                lines.append(f'{name}{{engine="{role}"}} {snap[key]}')
+    return lines
+
+
+CACHE_COUNTERS = {
+    "hits"         : ("ofc_result_cache_hits_total", "counter", "Result cache hits."),
+    "misses"       : ("ofc_result_cache_misses_total", "counter", "Result cache misses."),
+    "invalidations": (
+        "ofc_result_cache_invalidations_total", "counter", "Entries dropped by writes."
+    ),
+    "entries"      : ("ofc_result_cache_entries", "gauge", "Entries currently cached."),
+}
+
+
+def cache_lines(stats: dict) -> List[str]:
+    """Prometheus lines for app.services.result_cache.result_cache.stats()."""
+    lines: List[str] = []
+    for key, (name, kind, help) in CACHE_COUNTERS.items():
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+        lines.append(f'{name}{{backend="{stats["backend"]}"}} {stats[key]}')
+    return lines
+
+
+def render(extra: Sequence[str] = ()) -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(extra)
+    return "\n".join(lines) + "\n"
@@ -1,6 +1,18 @@
 from typing import Optional
-from datetime import datetime
-from sqlmodel import SQLModel, Field, UniqueConstraint
+from datetime import datetime, date
+from sqlmodel import SQLModel, Field, UniqueConstraint, Index
+
+# Ledger every request, script and pre-account row belongs to unless told otherwise.
+DEFAULT_ACCOUNT_ID = 1
+# DataRevision row for changes that are not one account's (categories, resets).
+SHARED_REVISION = 0
+
+
+class Account(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    __table_args__ = (UniqueConstraint("name", name="uq_account_name"),)
 
 
 class Category(SQLModel, table=True):
@@ -12,9 +24,41 @@ class Category(SQLModel, table=True):
 
 class Transaction(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
+    account_id: int = Field(
+        default=DEFAULT_ACCOUNT_ID, sa_column_kwargs={"server_default": str(DEFAULT_ACCOUNT_ID)}
+    )
     amount: float
     txn_type: str
     description: str
-    category: Optional[str] = Field(default=None, index=True)
+    category: Optional[str] = Field(default=None)
     occurred_at: datetime
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    content_hash: Optional[str] = Field(default=None)
+    # Every index leads with account_id: a tenant's queries only read its own
+    # slice of each b-tree, however many tenants share the table.
+    __table_args__ = (
+        Index("ix_transaction_account_occurred_at_id", "account_id", "occurred_at", "id"),
+        Index(
+            "ix_transaction_account_category_occurred_at", "account_id", "category", "occurred_at"
+        ),
+        Index(
+            "ix_transaction_account_txn_type_occurred_at", "account_id", "txn_type", "occurred_at"
+        ),
+        Index("ix_transaction_account_content_hash", "account_id", "content_hash"),
+    )
+
+
+class DailyBalance(SQLModel, table=True):
+    """Per-account, per-day rollup of the ledger, kept in step with Transaction writes."""
+
+    account_id: int = Field(default=DEFAULT_ACCOUNT_ID, primary_key=True)
+    day: date = Field(primary_key=True)
+    net: float = 0.0
+    txn_count: int = 0
+
+
+class DataRevision(SQLModel, table=True):
+    """Committed-change counter per account (SHARED_REVISION: shared data), for ETags."""
+
+    account_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    version: int = 0
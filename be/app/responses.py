@@ -0,0 +1,32 @@
+"""
+Fast JSON path for large read responses.
+
+Routes that already hold plain, trusted data (dicts / lists / datetimes read
+straight from the database) return `fast_json(...)` instead of a model: the
+body is encoded once by orjson, skipping FastAPI's response_model validation
+and jsonable_encoder walk. The route keeps its `response_model` for the
+OpenAPI schema.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+from app.metrics import TimedJSONResponse
+
+
+class ORJSONResponse(TimedJSONResponse):
+    def encode(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def fast_json(content: Any, response: Response, status_code: int = 200) -> ORJSONResponse:
+    """Encode `content` with orjson, keeping headers dependencies set (ETag, ...).
+
+    FastAPI only merges the injected `response` headers into responses it
+    builds itself, so they are copied over here.
+    """
+    out = ORJSONResponse(content, status_code=status_code)
+    out.raw_headers.extend(response.raw_headers)
+    return out
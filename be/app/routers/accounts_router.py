@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+from app.metrics import TimedRoute
+from app.schemas import AccountCreate, AccountRead
+from app.services import (
+    get_account_service,
+    get_account_reader,
+    AccountService,
+    ServiceFacade,
+)
+import logging
+
+logger = logging.getLogger("ofc.routers.accounts")
+
+router = APIRouter(prefix="/accounts", tags=["accounts"], route_class=TimedRoute)
+
+
+@router.get("", response_model=List[AccountRead])
+async def list_accounts(
+    svc: ServiceFacade[AccountService] = Depends(get_account_reader),
+):
+    """Every account with its current balance (from the daily rollup)."""
+    logger.debug("➡️  list_accounts called")
+    items = await svc.list()
+    logger.debug("✅  list_accounts count=%s", len(items))
+    return items
+
+
+@router.post("", response_model=AccountRead, status_code=201)
+async def create_account(
+    payload: AccountCreate,
+    svc: ServiceFacade[AccountService] = Depends(get_account_service),
+):
+    """Create an empty ledger; pass its id as `account_id=` to the other routes."""
+    logger.debug("➡️  create_account called name=%s", payload.name)
+    try:
+        a = await svc.create(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info("✅  create_account created id=%s name=%s", a.id, a.name)
+    return a
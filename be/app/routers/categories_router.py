@@ -1,35 +1,46 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from typing import Optional, List
-from sqlmodel import Session
-from app.database import get_session
 from app.schemas import CategoryCreate, CategoryRead
-from app.services import get_category_service, CategoryService
+from app.services import (
+    get_category_service,
+    get_category_reader,
+    CategoryService,
+    ServiceFacade,
+)
+from app.http_cache import conditional_get
+from app.metrics import TimedRoute
+from app.responses import fast_json
 import logging
 
 logger = logging.getLogger("ofc.routers.categories")
 
-router = APIRouter(prefix="/categories", tags=["categories"])
+router = APIRouter(prefix="/categories", tags=["categories"], route_class=TimedRoute)
 
 
-@router.get("", response_model=List[CategoryRead])
-def list_categories(
+@router.get(
+    "", response_model=List[CategoryRead], dependencies=[Depends(conditional_get)]
+)
+async def list_categories(
+    response: Response,
     q: Optional[str] = Query(None, description="starts-with filter"),
-    session: Session = Depends(get_session),
-    svc: CategoryService = Depends(get_category_service),
+    svc: ServiceFacade[CategoryService] = Depends(get_category_reader),
 ):
-    logger.info("➡️  list_categories called q=%s", q)
-    items = svc.list(q)
-    logger.info("✅  list_categories count=%s", len(items))
-    return [CategoryRead(**c.model_dump()) for c in items]
+    logger.debug("➡️  list_categories called q=%s", q)
+    items = await svc.list(q)
+    logger.debug("✅  list_categories count=%s", len(items))
+    return fast_json(
+        [{"id": c.id, "name": c.name, "created_at": c.created_at} for c in items],
+        response,
+    )
 
 
 @router.post("", response_model=CategoryRead, status_code=201)
-def create_category(
+async def create_category(
     payload: CategoryCreate,
-    session: Session = Depends(get_session),
-    svc: CategoryService = Depends(get_category_service),
+    svc: ServiceFacade[CategoryService] = Depends(get_category_service),
 ):
-    logger.info("➡️  create_category called payload=%s", payload.model_dump())
-    c = svc.create(payload)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("➡️  create_category called payload=%s", payload.model_dump())
+    c = await svc.create(payload)
     logger.info("✅  create_category created id=%s name=%s", c.id, c.name)
     return CategoryRead(**c.model_dump())
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import datetime
+
+from app.enums import ExportFormat
+from app.metrics import TimedRoute
+from app.services import get_account_id
+from app.services.export_service import (
+    COLUMNAR_FORMATS,
+    export_columnar,
+    export_transactions,
+    parse_columns,
+    require_pyarrow,
+)
+import logging
+
+logger = logging.getLogger("ofc.routers.export")
+
+router = APIRouter(prefix="/export", tags=["export"], route_class=TimedRoute)
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson : "application/x-ndjson",
+    ExportFormat.csv    : "text/csv",
+    ExportFormat.arrow  : "application/vnd.apache.arrow.stream",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+
+@router.get("")
+def export(
+    format: ExportFormat = Query(ExportFormat.ndjson),
+    category: Optional[str] = None,
+    txn_type: Optional[str] = Query(None, description="credit or debit"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    gzip: bool = Query(False, description="return a .gz file (ndjson / csv)"),
+    columns: Optional[str] = Query(
+        None, description="arrow / parquet: comma-separated columns to return"
+    ),
+    account_id: int = Depends(get_account_id),
+):
+    """
+    Stream transactions as NDJSON, CSV, an Arrow IPC stream or a Parquet file.
+    Rows are read from a server-side cursor and written in fixed-size
+    batches, so memory stays flat regardless of table size. Accepts the same
+    filters as GET /transactions; for arrow / parquet they and `columns` are
+    pushed into the query and batches are built column by column.
+    """
+    if txn_type and txn_type.strip().lower() not in ("credit", "debit"):
+        raise HTTPException(status_code=400, detail=f"Invalid txn_type: [{txn_type}]")
+    logger.info(
+        "➡️  export called account=%s format=%s category=%s type=%s start=%s end=%s gzip=%s columns=%s",
+        account_id,
+        format.value,
+        category,
+        txn_type,
+        start,
+        end,
+        gzip,
+        columns,
+    )
+    txn_type = txn_type.strip().lower() if txn_type else None
+    if format in COLUMNAR_FORMATS:
+        if gzip:
+            raise HTTPException(
+                status_code=400, detail=f"gzip is not supported for {format.value}"
+            )
+        try:
+            require_pyarrow()
+            selected = parse_columns(columns)
+        except RuntimeError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        body = export_columnar(
+            format, selected, category, txn_type, start, end, account_id=account_id
+        )
+    else:
+        body = export_transactions(
+            format, category, txn_type, start, end, gzip=gzip, account_id=account_id
+        )
+    filename = f"transactions.{format.value}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from typing import Optional
+import io
+
+from pydantic import ValidationError
+
+from app.importers import CsvMapping, FORMATS, detect_format, read_csv, read_ofx
+from app.metrics import TimedRoute
+from app.schemas import ImportReport
+from app.services import get_import_service, ImportService
+from app.services.import_service import DEFAULT_CHUNK_SIZE
+import logging
+
+logger = logging.getLogger("ofc.routers.imports")
+
+router = APIRouter(prefix="/import", tags=["import"], route_class=TimedRoute)
+
+
+@router.post("", response_model=ImportReport)
+def import_statement(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or ofx; guessed from the file name"),
+    mapping: Optional[str] = Form(None, description="CsvMapping as JSON (CSV only)"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=100, le=50000),
+    svc: ImportService = Depends(get_import_service),
+):
+    """
+    Import a bank statement (CSV or OFX/QFX). The upload is parsed as a stream
+    and written in chunks; rows already in that account are skipped.
+    """
+    fmt = (format or detect_format(file.filename or "")).lower()
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: [{fmt}]")
+    try:
+        csv_mapping = CsvMapping.model_validate_json(mapping) if mapping else CsvMapping()
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid mapping: {e}")
+    logger.info("➡️  import_statement called file=%s format=%s", file.filename, fmt)
+
+    # UploadFile spools large bodies to disk; wrap it rather than reading it.
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace", newline="")
+    records = read_csv(text, csv_mapping) if fmt == "csv" else read_ofx(text)
+    report = svc.run(records, chunk_size=chunk_size)
+    logger.info(
+        "✅  import_statement inserted=%s duplicates=%s failed=%s",
+        report.inserted,
+        report.duplicates,
+        report.failed,
+    )
+    return report
@@ -0,0 +1,33 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from typing import Dict
+
+from app import metrics
+from app.database import pool_engines
+from app.schemas import CacheMetrics, PoolMetrics
+from app.services.result_cache import result_cache
+from app.storage.pool import pool_snapshot
+
+router = APIRouter(prefix="/metrics", tags=["metrics"], route_class=metrics.TimedRoute)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """HTTP, SQL, serialization, pool and result cache metrics in Prometheus text format."""
+    snapshots = {role: pool_snapshot(eng) for role, eng in pool_engines().items()}
+    extra = metrics.pool_lines(snapshots) + metrics.cache_lines(result_cache.stats())
+    return PlainTextResponse(metrics.render(extra), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/pool", response_model=Dict[str, PoolMetrics], response_model_exclude_none=True)
+def pool_metrics():
+    """Connection pool occupancy and checkout wait times, per engine role."""
+    return {role: pool_snapshot(eng) for role, eng in pool_engines().items()}
+
+
+@router.get("/cache", response_model=CacheMetrics)
+def cache_metrics():
+    """Result cache size and hit / miss / invalidation counters."""
+    return result_cache.stats()
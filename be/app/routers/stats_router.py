@@ -1,28 +1,123 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional, List
 from datetime import datetime
-from sqlmodel import Session
-from app.database import get_session
-from app.schemas import BalancePoint
-from app.services import get_stats_service, StatsService
+import re
+from app.enums import Granularity, TxType
+from app.metrics import TimedRoute
+from app.schemas import BalancePoint, CashflowPoint, CategoryTotal, RollingPoint
+from app.services import get_stats_service, StatsService, ServiceFacade
+from app.http_cache import conditional_get
 import logging
 
 logger = logging.getLogger("ofc.routers.stats")
 
-router = APIRouter(prefix="/stats", tags=["stats"])
+router = APIRouter(prefix="/stats", tags=["stats"], route_class=TimedRoute)
 
 
-@router.get("/balance_over_time", response_model=List[BalancePoint])
-def balance_over_time(
+@router.get(
+    "/balance_over_time",
+    response_model=List[BalancePoint],
+    response_model_exclude_none=True,
+    dependencies=[Depends(conditional_get)],
+)
+async def balance_over_time(
     start: Optional[datetime] = None,
     end: Optional[datetime] = None,
-    svc: StatsService = Depends(get_stats_service),
+    granularity: Granularity = Query(
+        Granularity.raw, description="raw (one point per transaction) or bucket size"
+    ),
+    max_points: Optional[int] = Query(
+        None,
+        ge=1,
+        le=100000,
+        description="return at most this many points: coarsen granularity, then merge "
+        "adjacent months if needed",
+    ),
+    with_range: bool = Query(
+        False, alias="range", description="include min/max balance per bucket"
+    ),
+    svc: ServiceFacade[StatsService] = Depends(get_stats_service),
 ):
-    logger.info("➡️  balance_over_time called start=%s end=%s", start, end)
-    points = svc.balance_over_time(start, end)
-    logger.info(
+    logger.debug(
+        "➡️  balance_over_time called start=%s end=%s granularity=%s max_points=%s",
+        start,
+        end,
+        granularity,
+        max_points,
+    )
+    points = await svc.balance_over_time(
+        start, end, granularity, max_points, with_range
+    )
+    logger.debug(
         "✅  balance_over_time points=%s final_balance=%.2f",
         len(points),
         points[-1].balance if points else 0,
     )
     return points
+
+
+@router.get(
+    "/by_category",
+    response_model=List[CategoryTotal],
+    dependencies=[Depends(conditional_get)],
+)
+async def by_category(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    txn_type: Optional[TxType] = Query(None, description="credit or debit"),
+    svc: ServiceFacade[StatsService] = Depends(get_stats_service),
+):
+    """Credits, debits, net and count per category (one GROUP BY)."""
+    logger.debug("➡️  by_category called start=%s end=%s type=%s", start, end, txn_type)
+    return await svc.by_category(txn_type.value if txn_type else None, start, end)
+
+
+@router.get(
+    "/cashflow",
+    response_model=List[CashflowPoint],
+    dependencies=[Depends(conditional_get)],
+)
+async def cashflow(
+    period: Granularity = Query(Granularity.month, description="hour, day, week or month"),
+    category: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    svc: ServiceFacade[StatsService] = Depends(get_stats_service),
+):
+    """Credits, debits, net and count per period."""
+    logger.debug(
+        "➡️  cashflow called period=%s category=%s start=%s end=%s", period, category, start, end
+    )
+    try:
+        return await svc.cashflow(period, category, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+WINDOW_PATTERN = re.compile(r"^(\d+)d?$")
+MAX_WINDOW_DAYS = 366
+
+
+@router.get(
+    "/rolling",
+    response_model=List[RollingPoint],
+    dependencies=[Depends(conditional_get)],
+)
+async def rolling(
+    window: str = Query("30d", description="trailing window in days, e.g. 30d"),
+    category: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    svc: ServiceFacade[StatsService] = Depends(get_stats_service),
+):
+    """Trailing-window spend, income and average daily spend, clamped to the data."""
+    match = WINDOW_PATTERN.match(window.strip().lower())
+    days = int(match.group(1)) if match else 0
+    if not 1 <= days <= MAX_WINDOW_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid window: [{window}] (1d..{MAX_WINDOW_DAYS}d)"
+        )
+    logger.debug(
+        "➡️  rolling called window=%sd category=%s start=%s end=%s", days, category, start, end
+    )
+    return await svc.rolling(days, category, start, end)
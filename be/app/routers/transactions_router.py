@@ -1,60 +1,202 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from typing import Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from typing import Optional, List, Tuple, Any, AsyncIterator
 from datetime import datetime
+import json
 
-from app.schemas import TransactionCreate, TransactionRead, TransactionsResponse
-from app.services import get_transaction_service, TransactionService
+from app.schemas import (
+    TransactionCreate,
+    TransactionRead,
+    TransactionsResponse,
+    BulkResult,
+    BulkItemError,
+)
+from app.services import (
+    get_account_id,
+    get_transaction_service,
+    get_transaction_reader,
+    TransactionService,
+    ServiceFacade,
+)
+from app.services.group_commit import transaction_batcher
+from app.enums import ListOrder
+from app.http_cache import conditional_get
+from app.metrics import TimedRoute
+from app.responses import fast_json
 import logging
 
 logger = logging.getLogger("ofc.routers.transactions")
 
-router = APIRouter(prefix="/transactions", tags=["transactions"])
+router = APIRouter(
+    prefix="/transactions", tags=["transactions"], route_class=TimedRoute
+)
+
+BULK_CHUNK_SIZE = 1000
+BULK_MAX_REPORTED_ERRORS = 1000
 
 
 @router.post("", response_model=TransactionRead, status_code=201)
-def create_transaction(
+async def create_transaction(
         payload: TransactionCreate,
-        svc: TransactionService = Depends(get_transaction_service),
+        account_id: int = Depends(get_account_id),
+        svc: ServiceFacade[TransactionService] = Depends(get_transaction_service),
 ):
-    p = payload.model_dump()
-    logger.error(f"-----create_transaction called payload={p}")
-    created = svc.create(payload)
-    logger.info("✅  create_transaction completed id=%s", created.id)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "➡️  create_transaction called account=%s payload=%s", account_id, payload.model_dump()
+        )
+    if transaction_batcher is not None:
+        created = await transaction_batcher.submit(payload, account_id)
+    else:
+        created = await svc.create(payload)
+    logger.debug("✅  create_transaction completed id=%s", created.id)
     return TransactionRead(**created.model_dump())
 
 
-@router.get("", response_model=TransactionsResponse)
-def list_transactions(
+async def _ndjson_items(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (index, parsed line) from an NDJSON body without buffering it."""
+    index = 0
+    buf = b""
+    async for chunk in request.stream():
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, _parse_line(line)
+                index += 1
+    if buf.strip():
+        yield index, _parse_line(buf)
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return e
+
+
+async def _json_array_items(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    try:
+        data = json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+    if not isinstance(data, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array")
+    for index, item in enumerate(data):
+        yield index, item
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def create_transactions_bulk(
+        request: Request,
+        svc: ServiceFacade[TransactionService] = Depends(get_transaction_service),
+):
+    """
+    Insert many transactions from a JSON array or an NDJSON stream
+    (Content-Type: application/x-ndjson). Items are validated one by one and
+    written in chunks of BULK_CHUNK_SIZE, one commit per chunk; invalid items
+    are reported in `errors` and do not abort the batch.
+    """
+    content_type = request.headers.get("content-type", "")
+    ndjson = "ndjson" in content_type or "jsonl" in content_type
+    logger.info("➡️  create_transactions_bulk called ndjson=%s", ndjson)
+    items = _ndjson_items(request) if ndjson else _json_array_items(request)
+
+    inserted = 0
+    errors: List[Tuple[int, str]] = []
+    chunk: List[Tuple[int, Any]] = []
+
+    async def flush():
+        nonlocal inserted
+        n, errs = await svc.create_many(chunk)
+        inserted += n
+        errors.extend(errs)
+        chunk.clear()
+
+    async for index, item in items:
+        if isinstance(item, ValueError):
+            errors.append((index, f"Invalid JSON: {item}"))
+            continue
+        chunk.append((index, item))
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            await flush()
+    if chunk:
+        await flush()
+
+    logger.info(
+        "✅  create_transactions_bulk inserted=%s failed=%s", inserted, len(errors)
+    )
+    return BulkResult(
+        inserted=inserted,
+        failed=len(errors),
+        errors=[
+            BulkItemError(index=i, error=e)
+            for i, e in sorted(errors)[:BULK_MAX_REPORTED_ERRORS]
+        ],
+    )
+
+
+@router.get(
+    "",
+    response_model=TransactionsResponse,
+    dependencies=[Depends(conditional_get)],
+)
+async def list_transactions(
+        response: Response,
         category: Optional[str] = None,
         txn_type: Optional[str] = Query(None, description="credit or debit"),
         start: Optional[datetime] = datetime(2020, 1, 1),
         end: Optional[datetime] = None,  # datetime.now(),
-        limit: int = 100,
-        offset: int = 0,
-        svc: TransactionService = Depends(get_transaction_service),
+        limit: int = Query(100, ge=1, le=10000),
+        offset: int = Query(0, ge=0),
+        total: bool = Query(True, description="include total match count"),
+        cursor: Optional[str] = Query(None, description="next_cursor from a previous page"),
+        q: Optional[str] = Query(
+            None, max_length=200, description="full-text search in descriptions; last word matches as a prefix"
+        ),
+        order: ListOrder = Query(ListOrder.time, description="time, or relevance (needs q)"),
+        svc: ServiceFacade[TransactionService] = Depends(get_transaction_reader),
 ):
-    logger.info(
-        "➡️  list_transactions params category=%s type=%s start=%s end=%s limit=%s offset=%s",
+    logger.debug(
+        "➡️  list_transactions params category=%s type=%s start=%s end=%s limit=%s offset=%s total=%s cursor=%s q=%s order=%s",
         category,
         txn_type,
         start,
         end,
         limit,
         offset,
+        total,
+        cursor,
+        q,
+        order,
+    )
+    try:
+        items, count, next_cursor = await svc.list(
+            category, txn_type, start, end, limit, offset, total, cursor, q, order
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.debug("✅  list_transactions returned=%s items total=%s", len(items), count)
+    # Rows come straight from the DB in TransactionRead shape: encode them
+    # directly instead of re-validating every item against the response model.
+    return fast_json(
+        {
+            "items"      : items,
+            "total"      : count,
+            "next_cursor": next_cursor,
+        },
+        response,
     )
-    items, total = svc.list(category, txn_type, start, end, limit, offset)
-    logger.info("✅  list_transactions returned=%s items", total)
-    return {"items": [TransactionRead(**i.model_dump()) for i in items], "total": total}
 
 
 @router.delete("/{tx_id}", status_code=204)
-def delete_transaction(
-        tx_id: int, svc: TransactionService = Depends(get_transaction_service)
+async def delete_transaction(
+        tx_id: int,
+        svc: ServiceFacade[TransactionService] = Depends(get_transaction_service),
 ):
-    logger.info("➡️  delete_transaction called id=%s", tx_id)
-    ok = svc.delete(tx_id)
+    logger.debug("➡️  delete_transaction called id=%s", tx_id)
+    ok = await svc.delete(tx_id)
     if not ok:
         logger.warning("❌ delete_transaction not_found id=%s", tx_id)
         raise HTTPException(status_code=404, detail="Transaction not found")
-    logger.info("✅  delete_transaction ok id=%s", tx_id)
+    logger.debug("✅  delete_transaction ok id=%s", tx_id)
     return
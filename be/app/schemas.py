@@ -24,11 +24,39 @@ class TransactionRead(BaseModel):
 class BalancePoint(BaseModel):
     date: datetime
     balance: float
+    min: Optional[float] = Field(None, description="lowest balance in the bucket")
+    max: Optional[float] = Field(None, description="highest balance in the bucket")
 
 
 class TransactionsResponse(BaseModel):
     items: List[TransactionRead]
-    total: int
+    total: Optional[int] = Field(None, description="omitted when total=false")
+    next_cursor: Optional[str] = Field(None, description="pass as cursor= for the next page")
+
+
+class BulkItemError(BaseModel):
+    index: int = Field(..., description="0-based position in the submitted batch")
+    error: str
+
+
+class BulkResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkItemError] = Field(
+        default_factory=list, description="first errors only; see failed for the count"
+    )
+
+
+class ImportReport(BaseModel):
+    read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: List[BulkItemError] = Field(
+        default_factory=list, description="first errors only, indexed by line/record"
+    )
+    seconds: float = 0.0
+    rows_per_sec: float = 0.0
 
 
 class CategoryCreate(BaseModel):
@@ -39,3 +67,61 @@ class CategoryRead(BaseModel):
     id: int
     name: str
     created_at: datetime
+
+
+class AccountCreate(BaseModel):
+    name: str
+
+
+class AccountRead(BaseModel):
+    id: int
+    name: str
+    created_at: datetime
+    balance: float = Field(0.0, description="sum of the account's transactions")
+
+
+class PoolMetrics(BaseModel):
+    pool: str
+    size: Optional[int] = None
+    in_use: Optional[int] = Field(None, description="connections checked out now")
+    idle: Optional[int] = None
+    overflow: Optional[int] = Field(None, description="connections open beyond size")
+    max_overflow: Optional[int] = None
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = Field(None, description="checkouts that hit DB_POOL_TIMEOUT")
+    wait_seconds_total: Optional[float] = None
+    wait_seconds_max: Optional[float] = None
+
+
+class CategoryTotal(BaseModel):
+    category: Optional[str] = None
+    credits: float
+    debits: float = Field(..., description="outflow, as a positive amount")
+    net: float
+    count: int
+
+
+class CashflowPoint(BaseModel):
+    period: datetime = Field(..., description="start of the period")
+    credits: float
+    debits: float = Field(..., description="outflow, as a positive amount")
+    net: float
+    count: int
+
+
+class RollingPoint(BaseModel):
+    date: datetime
+    spend: float = Field(..., description="debits over the trailing window")
+    income: float = Field(..., description="credits over the trailing window")
+    net: float
+    avg_daily_spend: float
+
+
+class CacheMetrics(BaseModel):
+    backend: str
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    invalidations: int = Field(..., description="entries dropped by writes")
@@ -0,0 +1,115 @@
+"""
+Compare API throughput across logging configurations.
+
+For each mode a fresh uvicorn process is started on a scratch SQLite file with
+its stdout going to a log file (as on Cloud Run, where stdout is collected),
+then a fixed mix of POST /transactions and GET /transactions is driven over
+HTTP for `--seconds`. Prints one JSON object with req/s and log volume per mode.
+
+Usage:
+  python -m app.scripts.bench_logging --seconds 10 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+import httpx
+
+from app.bench.runner import wait_ready
+
+MODES: Dict[str, Dict[str, str]] = {
+    "text-sync-debug" : {"LOG_FORMAT": "text", "LOG_LEVEL": "DEBUG", "LOG_QUEUE": "0"},
+    "text-sync-info"  : {"LOG_FORMAT": "text", "LOG_LEVEL": "INFO", "LOG_QUEUE": "0"},
+    "text-queue-info" : {"LOG_FORMAT": "text", "LOG_LEVEL": "INFO", "LOG_QUEUE": "1"},
+    "json-queue-info" : {"LOG_FORMAT": "json", "LOG_LEVEL": "INFO", "LOG_QUEUE": "1"},
+    "json-queue-debug": {"LOG_FORMAT": "json", "LOG_LEVEL": "DEBUG", "LOG_QUEUE": "1"},
+}
+
+
+async def drive(base_url: str, seconds: float, concurrency: int) -> int:
+    deadline = time.perf_counter() + seconds
+    done = 0
+
+    async def client_loop(n: int):
+        nonlocal done
+        rnd = random.Random(n)
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+            while time.perf_counter() < deadline:
+                if rnd.random() < 0.5:
+                    r = await client.post(
+                        "/transactions",
+                        json={
+                            "amount"     : round(rnd.uniform(1, 500), 2),
+                            "txn_type"   : rnd.choice(["credit", "debit"]),
+                            "description": "bench",
+                            "category"   : rnd.choice(["rent", "groceries", "misc"]),
+                            "occurred_at": "2024-01-01T12:00:00",
+                        },
+                    )
+                else:
+                    r = await client.get("/transactions", params={"limit": 20, "total": "false"})
+                r.raise_for_status()
+                done += 1
+
+    await asyncio.gather(*(client_loop(n) for n in range(concurrency)))
+    return done
+
+
+def run_mode(name: str, env_overrides: Dict[str, str], args) -> Dict[str, float]:
+    workdir = tempfile.mkdtemp(prefix=f"ofc-bench-{name}-")
+    log_path = os.path.join(workdir, "stdout.log")
+    env = {
+        **os.environ,
+        **env_overrides,
+        "SQLITE_PATH": os.path.join(workdir, "bench.db"),
+        "PYTHONUNBUFFERED": "1",
+    }
+    env.pop("DATABASE_URL", None)
+    base_url = f"http://127.0.0.1:{args.port}"
+    with open(log_path, "wb") as out:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+             "--log-level", "warning", "--no-access-log"],
+            env=env,
+            stdout=out,
+            stderr=subprocess.STDOUT,
+        )
+        try:
+            wait_ready(base_url, proc)
+            asyncio.run(drive(base_url, 1, args.concurrency))  # warm-up
+            size_before = os.path.getsize(log_path)
+            started = time.perf_counter()
+            requests = asyncio.run(drive(base_url, args.seconds, args.concurrency))
+            elapsed = time.perf_counter() - started
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+    return {
+        "requests"         : requests,
+        "req_per_sec"      : round(requests / elapsed, 1),
+        "log_bytes_per_req": round((os.path.getsize(log_path) - size_before) / max(requests, 1), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark req/s per logging mode.")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", nargs="*", default=list(MODES), choices=list(MODES))
+    args = parser.parse_args()
+
+    results = {name: run_mode(name, MODES[name], args) for name in args.modes}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
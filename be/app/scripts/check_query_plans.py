@@ -0,0 +1,189 @@
+"""
+Run EXPLAIN QUERY PLAN on every repository query and fail on full table scans.
+
+The repository methods are executed against a scratch SQLite database built
+from the current models; every statement they issue is captured and explained.
+A plan step of the form `SCAN <table>` (no index) on a large table, or a
+temp B-tree sort of ungrouped rows, is reported as a failure.
+
+Usage:
+  python -m app.scripts.check_query_plans
+"""
+
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session, create_engine
+
+from app.enums import Granularity, ListOrder
+from app.storage import search_index
+from app.storage.accounts_repo import AccountRepository
+from app.storage.categories_repo import CategoryRepository
+from app.storage.daily_balance_repo import DailyBalanceRepository
+from app.storage.data_revision_repo import DataRevisionRepository
+from app.storage.transactions_repo import TransactionRepository
+
+# Tables small enough that scanning them is cheaper than any index.
+SMALL_TABLES = {"category", "account"}
+# Unfiltered aggregates read every row anyway; a sequential scan is their best plan.
+WHOLE_TABLE_AGGREGATES = {"cashflow", "account balances"}
+# Full-text matches come out of the FTS index in rowid order and are sorted
+# afterwards; that sort is bounded by the match count, not the table.
+SORTED_SEARCHES = {"list search", "list search category+range", "list search relevance"}
+
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?\"?(?P<table>\w+)\"?$")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE FOR ORDER BY")
+# An index range scan that probes an IN (subquery) list per row: cost follows
+# the range, not the list (e.g. a search walking the account's whole index).
+INDEX_RANGE = re.compile(r"^SEARCH \S+ USING (COVERING )?INDEX ")
+LIST_PROBE = re.compile(r"^LIST SUBQUERY")
+
+
+def repository_queries() -> List[Tuple[str, Callable[[Session], object]]]:
+    start = datetime(2024, 1, 1)
+    end = start + timedelta(days=30)
+    txs = TransactionRepository
+    cats = CategoryRepository
+    days = DailyBalanceRepository
+    accounts = AccountRepository
+    revisions = DataRevisionRepository
+    return [
+        ("list all", lambda s: txs(s).list_filtered(limit=100)),
+        ("list offset", lambda s: txs(s).list_filtered(limit=100, offset=500)),
+        ("list cursor", lambda s: txs(s).list_filtered(limit=100, after=(start, 10))),
+        ("list category", lambda s: txs(s).list_filtered("rent", limit=100)),
+        ("list txn_type", lambda s: txs(s).list_filtered(txn_type="debit", limit=100)),
+        ("list range", lambda s: txs(s).list_filtered(start=start, end=end)),
+        (
+            "list category+range",
+            lambda s: txs(s).list_filtered("rent", None, start, end, limit=100),
+        ),
+        (
+            "list txn_type+range",
+            lambda s: txs(s).list_filtered(None, "debit", start, end, limit=100),
+        ),
+        ("count all", lambda s: txs(s).count_filtered()),
+        ("count category", lambda s: txs(s).count_filtered("rent")),
+        ("count txn_type", lambda s: txs(s).count_filtered(txn_type="credit")),
+        ("count range", lambda s: txs(s).count_filtered(start=start, end=end)),
+        ("sum before", lambda s: txs(s).sum_before(start)),
+        ("running balance", lambda s: txs(s).running_balance()),
+        ("running balance range", lambda s: txs(s).running_balance(start, end)),
+        ("time span", lambda s: txs(s).time_span(start, end)),
+        (
+            "bucketed balance",
+            lambda s: txs(s).bucketed_balance(Granularity.day, start, end),
+        ),
+        ("rollup sum before", lambda s: days(s).sum_before(start.date())),
+        (
+            "rollup bucketed balance",
+            lambda s: days(s).bucketed_balance(
+                Granularity.week, start.date(), end.date()
+            ),
+        ),
+        ("list rows", lambda s: txs(s).list_rows("rent", None, start, end, limit=100)),
+        ("category totals", lambda s: txs(s).category_totals()),
+        ("category totals range", lambda s: txs(s).category_totals(None, start, end)),
+        ("cashflow", lambda s: txs(s).cashflow(Granularity.month)),
+        (
+            "cashflow category+range",
+            lambda s: txs(s).cashflow(Granularity.day, "rent", start, end),
+        ),
+        ("list search", lambda s: txs(s).list_rows(start=start, limit=100, search="gro")),
+        (
+            "list search category+range",
+            lambda s: txs(s).list_rows("rent", None, start, end, limit=100, search="monthly re"),
+        ),
+        (
+            "list search relevance",
+            lambda s: txs(s).list_rows(
+                "rent", None, start, limit=20, search="rent", order=ListOrder.relevance
+            ),
+        ),
+        ("count search", lambda s: txs(s).count_filtered("rent", start=start, search="rent")),
+        ("list cursor account 2", lambda s: txs(s, 2).list_rows(limit=100, after=(start, 10))),
+        ("count range account 2", lambda s: txs(s, 2).count_filtered(start=start, end=end)),
+        ("rollup sum before account 2", lambda s: days(s, 2).sum_before(start.date())),
+        ("hash counts", lambda s: txs(s).hash_counts(["a", "b"])),
+        ("account balances", lambda s: days(s).balances()),
+        ("get transaction", lambda s: txs(s).get(1)),
+        ("category by name", lambda s: cats(s).get_by_name("rent")),
+        ("list categories", lambda s: cats(s).list("re")),
+        ("account by name", lambda s: accounts(s).get_by_name("default")),
+        ("data revisions", lambda s: revisions(s).versions(2)),
+    ]
+
+
+def explain_all() -> List[Tuple[str, str, List[str]]]:
+    """Return (query name, sql, plan lines) for every repository query."""
+    tmpdir = tempfile.mkdtemp(prefix="ofc-plans-")
+    engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'plans.db')}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        search_index.ensure(conn)
+
+    captured: List[Tuple[str, object]] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith("EXPLAIN"):
+            captured.append((statement, parameters))
+
+    results = []
+    with Session(engine) as session:
+        for name, run in repository_queries():
+            captured.clear()
+            run(session)
+            for statement, parameters in list(captured):
+                rows = session.connection().exec_driver_sql(
+                    "EXPLAIN QUERY PLAN " + statement, parameters
+                )
+                results.append((name, statement, [r[3] for r in rows]))
+    engine.dispose()
+    return results
+
+
+def violations(plan: List[str]) -> List[str]:
+    bad = []
+    grouped = False  # sorting already-aggregated rows is cheap
+    ranges = [step for step in plan if INDEX_RANGE.match(step)]
+    if ranges and any(LIST_PROBE.match(step) for step in plan):
+        bad.extend(ranges)
+    for step in plan:
+        grouped = grouped or "FOR GROUP BY" in step
+        m = FULL_SCAN.match(step)
+        table = m.group("table") if m else None
+        if table in SQLModel.metadata.tables and table not in SMALL_TABLES:
+            bad.append(step)
+        elif TEMP_SORT.search(step) and not grouped:
+            bad.append(step)
+    return bad
+
+
+def main():
+    failures = 0
+    for name, statement, plan in explain_all():
+        if name in WHOLE_TABLE_AGGREGATES:
+            bad = []
+        elif name in SORTED_SEARCHES:
+            bad = [step for step in violations(plan) if not TEMP_SORT.search(step)]
+        else:
+            bad = violations(plan)
+        status = "❌" if bad else "✅"
+        print(f"{status} {name}: {' | '.join(plan)}")
+        if bad:
+            failures += 1
+            print(f"   SQL: {' '.join(statement.split())}")
+    if failures:
+        print(f"❌ {failures} repository queries fall back to a full scan.")
+        sys.exit(1)
+    print("✅ All repository queries use an index.")
+
+
+if __name__ == "__main__":
+    main()
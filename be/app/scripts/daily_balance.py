@@ -0,0 +1,50 @@
+"""
+Rebuild or verify the DailyBalance rollup against the Transaction ledger.
+
+Usage:
+  python -m app.scripts.daily_balance rebuild
+  python -m app.scripts.daily_balance check
+"""
+
+import argparse
+import sys
+
+from app.database import init_db, open_session
+from app.storage.daily_balance_repo import DailyBalanceRepository
+
+
+def rebuild():
+    with open_session() as session:
+        days = DailyBalanceRepository(session).rebuild()
+    print(f"✅ Daily balance rollup rebuilt: {days} days.")
+
+
+def check() -> int:
+    with open_session() as session:
+        drift = DailyBalanceRepository(session).mismatches()
+    for account, day, r_net, l_net, r_n, l_n in drift:
+        print(
+            f"❌ account {account} {day}: rollup net={r_net:.2f} count={r_n} "
+            f"| ledger net={l_net:.2f} count={l_n}"
+        )
+    if drift:
+        print(f"❌ {len(drift)} days differ; run `rebuild` to repair.")
+        return 1
+    print("✅ Daily balance rollup matches the ledger.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the daily balance rollup.")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args()
+
+    init_db()
+    if args.command == "rebuild":
+        rebuild()
+    else:
+        sys.exit(check())
+
+
+if __name__ == "__main__":
+    main()
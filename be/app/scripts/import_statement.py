@@ -0,0 +1,79 @@
+"""
+Import a CSV or OFX/QFX bank statement into the ledger.
+
+Usage:
+  python -m app.scripts.import_statement statement.ofx
+  python -m app.scripts.import_statement export.csv \
+      --map date=Date --map amount=Amount --map description=Payee \
+      --date-format %d/%m/%Y
+  python -m app.scripts.import_statement statement.ofx --account 2
+"""
+
+import argparse
+import os
+import sys
+
+from app.database import init_db, open_session
+from app.importers import CsvMapping, FORMATS, detect_format, read_csv, read_ofx
+from app.models import DEFAULT_ACCOUNT_ID
+from app.services.accounts_service import known_accounts
+from app.services.import_service import DEFAULT_CHUNK_SIZE, ImportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a bank statement.")
+    parser.add_argument("path", help="CSV or OFX/QFX file")
+    parser.add_argument("--format", choices=FORMATS, help="default: from extension")
+    parser.add_argument(
+        "--map",
+        action="append",
+        default=[],
+        metavar="FIELD=COLUMN",
+        help="CSV column mapping, e.g. amount=Amount (repeatable)",
+    )
+    parser.add_argument("--date-format", help="strptime format of the CSV date column")
+    parser.add_argument("--delimiter", default=",", help="CSV delimiter")
+    parser.add_argument("--encoding", default="utf-8-sig")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--account", type=int, default=DEFAULT_ACCOUNT_ID, help="account id")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    mapping = CsvMapping(
+        **dict(m.split("=", 1) for m in args.map),
+        date_format=args.date_format,
+        delimiter=args.delimiter,
+    )
+    init_db()
+    if not known_accounts.exists(args.account):
+        print(f"❌ Account not found: [{args.account}]")
+        sys.exit(1)
+
+    size = os.path.getsize(args.path)
+
+    def progress(report):
+        print(
+            f"… {report.read} read, {report.inserted} inserted, "
+            f"{report.duplicates} duplicates, {report.failed} failed "
+            f"({report.rows_per_sec:.0f} rows/s)"
+        )
+
+    with open(args.path, encoding=args.encoding, errors="replace", newline="") as f:
+        records = read_csv(f, mapping) if fmt == "csv" else read_ofx(f)
+        with open_session() as session:
+            report = ImportService(session, args.account).run(
+                records, chunk_size=args.chunk_size, on_progress=progress
+            )
+
+    for err in report.errors[:20]:
+        print(f"❌ #{err.index}: {err.error}")
+    print(
+        f"✅ Imported {os.path.basename(args.path)} ({size / 1e6:.1f} MB): "
+        f"{report.inserted} inserted, {report.duplicates} duplicates, "
+        f"{report.failed} failed in {report.seconds:.1f}s "
+        f"({report.rows_per_sec:.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
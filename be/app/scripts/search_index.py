@@ -0,0 +1,49 @@
+"""
+Rebuild or verify the full-text search index over transaction descriptions.
+
+Usage:
+  python -m app.scripts.search_index rebuild
+  python -m app.scripts.search_index check
+"""
+
+import argparse
+import sys
+import time
+
+from app.database import engine, init_db
+from app.storage import search_index
+
+
+def rebuild():
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        search_index.ensure(conn)
+        search_index.rebuild(conn)
+    print(f"✅ Search index rebuilt in {time.perf_counter() - started:.1f}s.")
+
+
+def check() -> int:
+    with engine.begin() as conn:
+        problem = search_index.check(conn)
+    if problem:
+        print(f"❌ Search index does not match the ledger: {problem}")
+        print("❌ Run `rebuild` to repair.")
+        return 1
+    print("✅ Search index matches the ledger.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the full-text search index.")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args()
+
+    init_db()
+    if args.command == "rebuild":
+        rebuild()
+    else:
+        sys.exit(check())
+
+
+if __name__ == "__main__":
+    main()
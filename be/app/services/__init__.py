@@ -1,21 +1,76 @@
 from .transactions_service import TransactionService
 from .categories_service import CategoryService
 from .stats_service import StatsService
+from .import_service import ImportService
+from .accounts_service import AccountService, known_accounts
+from .facade import ServiceFacade
 
-from app.database import get_session
+from functools import partial
+
+from app.database import get_session, get_db_read_session, get_db_write_session
+from app.models import DEFAULT_ACCOUNT_ID
 from sqlmodel import Session
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+
+
+async def get_account_id(
+    account_id: int = Query(DEFAULT_ACCOUNT_ID, ge=1, description="ledger to read / write"),
+) -> int:
+    if account_id not in known_accounts and not await run_in_threadpool(
+        known_accounts.exists, account_id
+    ):
+        raise HTTPException(status_code=404, detail=f"Account not found: [{account_id}]")
+    return account_id
 
 
 def get_transaction_service(
-    session: Session = Depends(get_session),
-) -> TransactionService:
-    return TransactionService(session)
+    session=Depends(get_db_write_session),
+    account_id: int = Depends(get_account_id),
+) -> ServiceFacade[TransactionService]:
+    return ServiceFacade(partial(TransactionService, account_id=account_id), session)
+
+
+def get_transaction_reader(
+    session=Depends(get_db_read_session),
+    account_id: int = Depends(get_account_id),
+) -> ServiceFacade[TransactionService]:
+    return ServiceFacade(partial(TransactionService, account_id=account_id), session)
+
+
+def get_category_service(
+    session=Depends(get_db_write_session),
+) -> ServiceFacade[CategoryService]:
+    return ServiceFacade(CategoryService, session)
 
 
-def get_category_service(session: Session = Depends(get_session)) -> CategoryService:
-    return CategoryService(session)
+def get_category_reader(
+    session=Depends(get_db_read_session),
+) -> ServiceFacade[CategoryService]:
+    return ServiceFacade(CategoryService, session)
 
 
-def get_stats_service(session: Session = Depends(get_session)) -> StatsService:
-    return StatsService(session)
+def get_stats_service(
+    session=Depends(get_db_read_session),
+    account_id: int = Depends(get_account_id),
+) -> ServiceFacade[StatsService]:
+    return ServiceFacade(partial(StatsService, account_id=account_id), session)
+
+
+def get_account_service(
+    session=Depends(get_db_write_session),
+) -> ServiceFacade[AccountService]:
+    return ServiceFacade(AccountService, session)
+
+
+def get_account_reader(
+    session=Depends(get_db_read_session),
+) -> ServiceFacade[AccountService]:
+    return ServiceFacade(AccountService, session)
+
+
+def get_import_service(
+    session: Session = Depends(get_session),
+    account_id: int = Depends(get_account_id),
+) -> ImportService:
+    return ImportService(session, account_id)
@@ -0,0 +1,84 @@
+import threading
+from typing import List, Set
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from ..database import open_session
+from ..models import Account
+from ..schemas import AccountCreate, AccountRead
+from ..storage.accounts_repo import AccountRepository
+from ..storage.daily_balance_repo import DailyBalanceRepository
+import logging
+
+log = logging.getLogger("ofc.services.accounts")
+
+
+class KnownAccounts:
+    """Process-wide set of account ids seen to exist.
+
+    Accounts are never deleted, so a hit needs no database round-trip; a miss
+    is looked up once and remembered. Requests for an id that does not exist
+    keep hitting the database, which is what a 404 costs anyway.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Set[int] = set()
+
+    def __contains__(self, account_id: int) -> bool:
+        return account_id in self._ids
+
+    def add(self, account_id: int) -> None:
+        with self._lock:
+            self._ids = self._ids | {account_id}
+
+    def exists(self, account_id: int) -> bool:
+        """True if the account exists; queries the database on a cache miss."""
+        if account_id in self._ids:
+            return True
+        with open_session() as session:
+            found = session.get(Account, account_id) is not None
+        if found:
+            self.add(account_id)
+        return found
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids = set()
+
+
+known_accounts = KnownAccounts()
+
+
+class AccountService:
+    def __init__(self, session: Session):
+        self.session = session
+        self.repo = AccountRepository(session)
+        self.rollup = DailyBalanceRepository(session)
+
+    def list(self) -> List[AccountRead]:
+        log.debug("🧩 Service: list accounts")
+        balances = self.rollup.balances()
+        return [
+            AccountRead(
+                id=a.id, name=a.name, created_at=a.created_at, balance=balances.get(a.id, 0.0)
+            )
+            for a in self.repo.list()
+        ]
+
+    def create(self, payload: AccountCreate) -> AccountRead:
+        name = payload.name.strip()
+        if not name:
+            raise ValueError("Account name required")
+        if self.repo.get_by_name(name):
+            raise ValueError(f"Account already exists: [{name}]")
+        try:
+            created = self.repo.add(Account(name=name))
+        except IntegrityError:
+            # Another worker created it between our lookup and insert.
+            self.session.rollback()
+            raise ValueError(f"Account already exists: [{name}]")
+        known_accounts.add(created.id)
+        log.info("🧩 Service: account created id=%s name=%s", created.id, created.name)
+        return AccountRead(id=created.id, name=created.name, created_at=created.created_at)
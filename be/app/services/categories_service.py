@@ -1,8 +1,11 @@
-from typing import Optional
+from typing import Optional, Iterable
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session
 from ..models import Category
 from ..schemas import CategoryCreate
 from ..storage.categories_repo import CategoryRepository
+from .category_cache import category_cache
+from .data_version import data_version
 import logging
 
 log = logging.getLogger("ofc.services.categories")
@@ -10,23 +13,47 @@ log = logging.getLogger("ofc.services.categories")
 
 class CategoryService:
     def __init__(self, session: Session):
+        self.session = session
         self.repo = CategoryRepository(session)
 
     def list(self, q: Optional[str] = None):
-        log.info("🧩 Service: list categories q=%s", q)
-        return self.repo.list(starts_with=q)
+        log.debug("🧩 Service: list categories q=%s", q)
+        return category_cache.list(self.session, q)
 
     def create_if_missing(self, name: str) -> Category:
         name = name.strip()
         if not name:
             raise ValueError("Category name required")
+        cached = category_cache.get(self.session, name)
+        if cached:
+            return cached
         found = self.repo.get_by_name(name)
         if found:
-            log.info("🧩 Service: category exists name=%s id=%s", name, found.id)
+            log.debug("🧩 Service: category exists name=%s id=%s", name, found.id)
+            category_cache.put_on_commit(self.session, found)
             return found
-        created = self.repo.add(Category(name=name))
+        data_version.touch(self.session)
+        try:
+            created = self.repo.insert(Category(name=name))
+            # Cached only once the COMMIT lands (the writer's batch commit, not
+            # this job's savepoint), and never if it rolls back.
+            category_cache.put_on_commit(self.session, created)
+            self.session.commit()
+            self.session.refresh(created)
+        except IntegrityError:
+            # Another worker inserted it between our lookup and insert.
+            self.session.rollback()
+            created = self.repo.get_by_name(name)
         log.info("🧩 Service: category created id=%s name=%s", created.id, created.name)
         return created
 
+    def ensure_many(self, names: Iterable[str]) -> None:
+        """Stage an upsert of the names not already cached (no commit)."""
+        missing = {n for n in names if category_cache.get(self.session, n) is None}
+        if missing:
+            data_version.touch(self.session)
+            self.repo.ensure_names(missing)
+            category_cache.invalidate_on_commit(self.session)
+
     def create(self, payload: CategoryCreate) -> Category:
         return self.create_if_missing(payload.name)
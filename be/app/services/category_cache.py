@@ -0,0 +1,128 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from ..models import Category
+from ..storage.categories_repo import CategoryRepository
+import logging
+
+log = logging.getLogger("ofc.services.category_cache")
+
+_PENDING = "ofc.category_cache.pending"
+
+# name -> Category, and the same categories sorted by name
+State = Tuple[Dict[str, Category], List[Category]]
+
+
+class CategoryCache:
+    """Process-wide name -> Category map, loaded once and kept in step on writes.
+
+    Readers never lock: every change swaps in a new immutable (by_name,
+    sorted) pair (copy on write), which is cheap because the category set is
+    tiny. Entries are detached copies, so they stay valid after the loading
+    session is closed. Each uvicorn process has its own cache; a miss still
+    falls back to the database, so categories created by another process are
+    picked up on first use.
+
+    Writes stage their cache change on the session (put_on_commit /
+    invalidate_on_commit); it is applied in after_commit, once readers can see
+    the rows, and dropped if the transaction or the job's savepoint rolls
+    back. A load that raced with an invalidation is returned to its caller
+    but not published, so a pre-commit snapshot can never stick.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Optional[State] = None
+        self._generation = 0
+
+    @staticmethod
+    def _copy(c: Category) -> Category:
+        return Category(id=c.id, name=c.name, created_at=c.created_at)
+
+    @staticmethod
+    def _build(categories: Iterable[Category]) -> State:
+        by_name = {c.name: c for c in categories}
+        return by_name, sorted(by_name.values(), key=lambda c: c.name)
+
+    def warm(self, session: Session) -> int:
+        return len(self._load(session)[1])
+
+    def _load(self, session: Session) -> State:
+        generation = self._generation
+        # Query before taking the lock: a writer blocked in put() holds a pooled
+        # connection, so waiting for one while holding the lock can deadlock.
+        state = self._build(self._copy(c) for c in CategoryRepository(session).list())
+        with self._lock:
+            if generation == self._generation:
+                self._state = state
+        log.info("🧩 Cache: categories loaded count=%s", len(state[1]))
+        return state
+
+    def _ensure(self, session: Session) -> State:
+        state = self._state
+        return state if state is not None else self._load(session)
+
+    def get(self, session: Session, name: str) -> Optional[Category]:
+        return self._ensure(session)[0].get(name)
+
+    def list(self, session: Session, starts_with: Optional[str] = None) -> List[Category]:
+        items = self._ensure(session)[1]
+        if starts_with:
+            prefix = starts_with.lower()
+            items = [c for c in items if c.name.lower().startswith(prefix)]
+        return list(items)
+
+    def put(self, category: Category) -> None:
+        with self._lock:
+            if self._state is not None:
+                self._state = self._build([*self._state[0].values(), self._copy(category)])
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._state = None
+
+    def put_on_commit(self, session: Session, category: Category) -> None:
+        """Add `category` (flushed, with its id) once the session commits."""
+        self._stage(session, self._copy(category))
+
+    def invalidate_on_commit(self, session: Session) -> None:
+        """Drop the cache once the session commits."""
+        self._stage(session, None)
+
+    @staticmethod
+    def _stage(session: Session, change: Optional[Category]) -> None:
+        tx = session.get_nested_transaction() or session.get_transaction()
+        session.info.setdefault(_PENDING, []).append((tx, change))
+
+
+category_cache = CategoryCache()
+
+
+def _within(tx, ended) -> bool:
+    while tx is not None:
+        if tx is ended:
+            return True
+        tx = tx.parent
+    return False
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session: Session) -> None:
+    for _, change in session.info.pop(_PENDING, ()):
+        if change is None:
+            category_cache.invalidate()
+        else:
+            category_cache.put(change)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_after_rollback(session: Session, previous_transaction) -> None:
+    # Also fires for the writer's per-job SAVEPOINT rollbacks, which never
+    # reach after_rollback: drop only what that savepoint staged.
+    pending = session.info.get(_PENDING)
+    if pending:
+        pending[:] = [(tx, c) for tx, c in pending if not _within(tx, previous_transaction)]
@@ -0,0 +1,121 @@
+"""
+Data versions for ETags.
+
+Env:
+  DATA_VERSION  memory (default on SQLite): per-process counters
+                db (default otherwise): DataRevision rows shared by every process
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Set
+
+from sqlalchemy import event
+from sqlmodel import Session
+import logging
+
+from app.database import IS_SQLITE, engine, read_engine
+from app.models import SHARED_REVISION
+from app.storage.data_revision_repo import DataRevisionRepository
+
+log = logging.getLogger("ofc.services.data_version")
+
+DATA_VERSION = os.getenv("DATA_VERSION", "memory" if IS_SQLITE else "db").lower()
+
+_PENDING = "ofc.data_version.pending"
+
+
+class DataVersion:
+    """Process-wide counters of committed data changes, used to build ETags.
+
+    Write paths call touch(session, account_id) before committing; the
+    counter moves in the session's after_commit hook, i.e. only once the
+    change is visible to readers (for the SQLite writer that is the batch
+    COMMIT, not the job's savepoint). A reader that tags its response with
+    the version it saw before querying can therefore never label old data
+    with a new version.
+
+    Counters are per account, so one tenant's writes leave the other tenants'
+    ETags valid. Changes to shared data (categories) and resets touch the
+    global counter, which is part of every account's token.
+
+    The token also carries a per-boot prefix so a restart invalidates every
+    ETag handed out before it. These counters are per process: a write made
+    by another worker or instance is not seen until this one writes or
+    restarts.
+
+    With shared=True (DATA_VERSION=db) the counters are DataRevision rows
+    instead: the writing transaction bumps them in before_commit, and token()
+    reads them, so every process sharing the database agrees on the version.
+    That costs one primary-key lookup per token.
+    """
+
+    def __init__(self, shared: bool = False):
+        self._lock = threading.Lock()
+        self._value = 0
+        self._accounts: Dict[int, int] = {}
+        self.boot = f"{os.getpid():x}{time.time_ns():x}"
+        self.shared = shared
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def token(self, account_id: Optional[int] = None) -> str:
+        if self.shared:
+            with Session(read_engine) as session:
+                shared, account = DataRevisionRepository(session).versions(
+                    SHARED_REVISION if account_id is None else account_id
+                )
+            return f"db-{shared}.{account}"
+        return f"{self.boot}-{self._value}.{self._accounts.get(account_id, 0)}"
+
+    def bump(self, account_id: Optional[int] = None) -> None:
+        """Move one account's counter, or the global one when account_id is None."""
+        if self.shared:
+            # Outside any write session (resets, seeding): bump in a transaction of its own.
+            with Session(engine) as session:
+                DataRevisionRepository(session).bump([_revision(account_id)])
+                session.commit()
+            log.debug("🧩 DataVersion: bumped account=%s (shared)", account_id)
+            return
+        with self._lock:
+            if account_id is None:
+                self._value += 1
+                value = self._value
+            else:
+                value = self._accounts[account_id] = self._accounts.get(account_id, 0) + 1
+        log.debug("🧩 DataVersion: bumped account=%s to %s", account_id, value)
+
+    def touch(self, session: Session, account_id: Optional[int] = None) -> None:
+        """Mark the transaction as changing `account_id`'s data (None: shared); bump on commit."""
+        pending: Set[Optional[int]] = session.info.setdefault(_PENDING, set())
+        pending.add(account_id)
+
+
+def _revision(account_id: Optional[int]) -> int:
+    return SHARED_REVISION if account_id is None else account_id
+
+
+data_version = DataVersion(shared=DATA_VERSION == "db")
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(session: Session) -> None:
+    pending = session.info.get(_PENDING)
+    if data_version.shared and pending:
+        DataRevisionRepository(session).bump(_revision(a) for a in pending)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING, ())
+    if not data_version.shared:
+        for account_id in pending:
+            data_version.bump(account_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING, None)
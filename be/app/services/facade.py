@@ -0,0 +1,56 @@
+from typing import Any, Generic, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.storage.writer import SqliteWriter
+
+S = TypeVar("S")
+
+
+class ServiceFacade(Generic[S]):
+    """Awaitable view of a sync service, so endpoints can be `async def` in both DB modes.
+
+    Bound to a plain Session, each call runs in Starlette's threadpool, the
+    same as a sync endpoint would. Bound to an AsyncSession, each call runs
+    through AsyncSession.run_sync: the repository code executes on the event
+    loop in a greenlet and every DB round-trip is awaited on the async driver
+    (aiosqlite / asyncpg), so no worker thread is held while waiting.
+    Bound to the SqliteWriter (SQLITE_PROFILE=production), each call is queued
+    to the writer thread and the service is built on the writer's session there.
+    """
+
+    def __init__(self, factory, session: Any):
+        self._async_session = None
+        self._writer = None
+        if isinstance(session, SqliteWriter):
+            self._writer, self._factory = session, factory
+            return
+        if hasattr(session, "run_sync"):
+            self._async_session = session
+            session = session.sync_session
+        self.service: S = factory(session)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._writer is not None:
+
+            async def queued(*args, **kwargs):
+                return await self._writer.run(
+                    lambda session: getattr(self._factory(session), name)(*args, **kwargs)
+                )
+
+            return queued
+
+        attr = getattr(self.service, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            if self._async_session is not None:
+                return await self._async_session.run_sync(
+                    lambda _session: attr(*args, **kwargs)
+                )
+            return await run_in_threadpool(attr, *args, **kwargs)
+
+        return call
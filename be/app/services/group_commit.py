@@ -0,0 +1,126 @@
+import asyncio
+import os
+from typing import List, Optional, Tuple
+
+from ..database import ASYNC_DB, async_engine, open_session, writer
+from ..models import Transaction, DEFAULT_ACCOUNT_ID
+from ..schemas import TransactionCreate
+from .facade import ServiceFacade
+from .transactions_service import TransactionService
+import logging
+
+log = logging.getLogger("ofc.services.group_commit")
+
+# GROUP_COMMIT=1: POST /transactions requests arriving within
+# GROUP_COMMIT_WINDOW_MS of each other (up to GROUP_COMMIT_MAX_ITEMS) share
+# one transaction and one commit.
+GROUP_COMMIT = os.getenv("GROUP_COMMIT", "0").lower() in ("1", "true", "yes")
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("GROUP_COMMIT_WINDOW_MS", 5))
+GROUP_COMMIT_MAX_ITEMS = int(os.getenv("GROUP_COMMIT_MAX_ITEMS", 256))
+
+Pending = Tuple[TransactionCreate, int, asyncio.Future]
+
+
+async def _create_batch(payloads: List[TransactionCreate], account_ids: List[int]):
+    """Run TransactionService.create_batch on a fresh session for the DB mode."""
+    if writer is not None:
+        return await ServiceFacade(TransactionService, writer).create_batch(
+            payloads, account_ids
+        )
+    if ASYNC_DB:
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            return await ServiceFacade(TransactionService, session).create_batch(
+                payloads, account_ids
+            )
+    with open_session() as session:
+        return await ServiceFacade(TransactionService, session).create_batch(
+            payloads, account_ids
+        )
+
+
+class TransactionBatcher:
+    """Collects concurrent creates and writes them with a single commit.
+
+    One flusher task per event loop takes the first waiting request, keeps
+    collecting for `window_ms` or until `max_items`, then inserts the batch.
+    Requests that arrive while a batch is being written form the next one, so
+    batches grow with load and throughput follows batch size rather than
+    commit latency. A batch may mix accounts; each row keeps its own.
+    """
+
+    def __init__(self, window_ms: float = 5, max_items: int = 256):
+        self.window = window_ms / 1000
+        self.max_items = max_items
+        self._queue: Optional["asyncio.Queue[Pending]"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def submit(
+        self, payload: TransactionCreate, account_id: int = DEFAULT_ACCOUNT_ID
+    ) -> Transaction:
+        self._ensure_started()
+        fut = self._loop.create_future()
+        self._queue.put_nowait((payload, account_id, fut))
+        return await fut
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _collect(self) -> List[Pending]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.window
+        while len(batch) < self.max_items:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                results = await _create_batch(
+                    [p for p, _, _ in batch], [a for _, a, _ in batch]
+                )
+            except Exception as e:
+                log.error("❌ group commit failed items=%s error=%s", len(batch), e)
+                results = [e] * len(batch)
+            log.debug("🧩 group commit flushed items=%s", len(batch))
+            for (_, _, fut), result in zip(batch, results):
+                if fut.done():
+                    continue
+                if isinstance(result, Exception):
+                    fut.set_exception(result)
+                else:
+                    fut.set_result(result)
+
+
+transaction_batcher = (
+    TransactionBatcher(GROUP_COMMIT_WINDOW_MS, GROUP_COMMIT_MAX_ITEMS)
+    if GROUP_COMMIT
+    else None
+)
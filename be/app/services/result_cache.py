@@ -0,0 +1,285 @@
+"""
+Query-result cache for stats and filtered listings.
+
+Entries are keyed by the normalized query parameters and carry a scope: the
+account, the category filter (None = all categories) and the occurred_at
+window the result depends on (None = unbounded on that side). Writes record
+which accounts, categories and time span they touched on the session; after
+the commit, only entries of those accounts whose scope overlaps are dropped.
+Entries also expire after a TTL and the in-process backend is a bounded LRU.
+
+Env:
+  RESULT_CACHE              memory (default) | redis | off
+  RESULT_CACHE_URL          redis URL for RESULT_CACHE=redis (install `redis` separately)
+  RESULT_CACHE_TTL          seconds, default 60
+  RESULT_CACHE_MAX_ENTRIES  default 1024
+"""
+
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlmodel import Session
+import logging
+
+log = logging.getLogger("ofc.services.result_cache")
+
+RESULT_CACHE = os.getenv("RESULT_CACHE", "memory").lower()
+RESULT_CACHE_URL = os.getenv("RESULT_CACHE_URL", "redis://localhost:6379/0")
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "60"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+
+_TOUCHED = "ofc.result_cache.touched"
+
+# (account, category or None for all, start or None, end or None)
+Scope = Tuple[int, Optional[str], Optional[datetime], Optional[datetime]]
+# (account, category) of the written rows -> (earliest, latest) occurred_at written
+Touched = Dict[Tuple[int, Optional[str]], Tuple[datetime, datetime]]
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def make_scope(
+    account_id: int,
+    category: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Scope:
+    """Scope of a cached result; timestamps compared as naive UTC like the ledger."""
+    return account_id, category, _naive_utc(start), _naive_utc(end)
+
+
+def scope_affected(scope: Scope, touched: Touched) -> bool:
+    account_id, category, start, end = scope
+    for (acct, cat), (lo, hi) in touched.items():
+        if acct != account_id or (category is not None and cat != category):
+            continue
+        if (start is None or hi >= start) and (end is None or lo <= end):
+            return True
+    return False
+
+
+class MemoryBackend:
+    """Bounded LRU with per-entry expiry; one lock, O(1) get/set."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Scope, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[2]
+
+    def set(self, key: str, value: Any, scope: Scope, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, scope, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, touched: Touched) -> int:
+        with self._lock:
+            stale = [k for k, (_, scope, _) in self._entries.items() if scope_affected(scope, touched)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Shared cache for several instances: values and scopes live in Redis.
+
+    Values are pickled under `<prefix>v:<key>` with the TTL as expiry; a hash
+    holds each key's scope for invalidation and a sorted set its last use for
+    LRU trimming. Every instance invalidates the shared entries after its own
+    commits.
+    """
+
+    def __init__(self, url: str, max_entries: int, prefix: str = "ofc:rc:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESULT_CACHE=redis needs the `redis` package") from e
+        self.client = redis.Redis.from_url(url)
+        self.max_entries = max_entries
+        self.prefix = prefix
+        self.scopes_key = prefix + "scopes"
+        self.lru_key = prefix + "lru"
+
+    def _value_key(self, key: str) -> str:
+        return f"{self.prefix}v:{key}"
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        raw = self.client.get(self._value_key(key))
+        if raw is None:
+            return False, None
+        self.client.zadd(self.lru_key, {key: time.time()})
+        return True, pickle.loads(raw)
+
+    def set(self, key: str, value: Any, scope: Scope, ttl: float) -> None:
+        pipe = self.client.pipeline()
+        pipe.set(self._value_key(key), pickle.dumps(value), px=int(ttl * 1000))
+        pipe.hset(self.scopes_key, key, pickle.dumps(scope))
+        pipe.zadd(self.lru_key, {key: time.time()})
+        pipe.zcard(self.lru_key)
+        size = pipe.execute()[-1]
+        if size > self.max_entries:
+            evicted = [k.decode() for k, _ in self.client.zpopmin(self.lru_key, size - self.max_entries)]
+            self._delete(evicted)
+
+    def _delete(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        pipe = self.client.pipeline()
+        pipe.delete(*(self._value_key(k) for k in keys))
+        pipe.hdel(self.scopes_key, *keys)
+        pipe.zrem(self.lru_key, *keys)
+        pipe.execute()
+
+    def invalidate(self, touched: Touched) -> int:
+        stale = [
+            k.decode()
+            for k, raw in self.client.hgetall(self.scopes_key).items()
+            if scope_affected(pickle.loads(raw), touched)
+        ]
+        self._delete(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        keys = [k.decode() for k in self.client.hkeys(self.scopes_key)]
+        self._delete(keys)
+
+    def __len__(self) -> int:
+        return self.client.zcard(self.lru_key)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class ResultCache:
+    """Front for a backend: hit/miss counting and write-safe population.
+
+    Invalidation bumps an epoch under the lock; a miss stores its result only
+    if no invalidation ran while it was querying, so a read that raced a
+    commit can not re-cache pre-commit data.
+    """
+
+    def __init__(self, backend, ttl: float = RESULT_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        self._epoch = 0
+
+    @staticmethod
+    def key(namespace: str, **params: Any) -> str:
+        return namespace + "?" + "&".join(
+            f"{k}={_normalize(v)}" for k, v in sorted(params.items())
+        )
+
+    def get_or_compute(self, key: str, scope: Scope, compute: Callable[[], Any]) -> Any:
+        if self.backend is None:
+            return compute()
+        found, value = self.backend.get(key)
+        with self._lock:
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            epoch = self._epoch
+        value = compute()
+        with self._lock:
+            if epoch == self._epoch:
+                self.backend.set(key, value, scope, self.ttl)
+        return value
+
+    def touch(
+        self, session: Session, rows: Iterable[Tuple[int, Optional[str], datetime]]
+    ) -> None:
+        """Record (account, category, occurred_at) of written rows; invalidated on commit."""
+        touched: Touched = session.info.setdefault(_TOUCHED, {})
+        for account_id, category, occurred_at in rows:
+            occurred_at = _naive_utc(occurred_at)
+            lo, hi = touched.get((account_id, category), (occurred_at, occurred_at))
+            touched[(account_id, category)] = (min(lo, occurred_at), max(hi, occurred_at))
+
+    def invalidate(self, touched: Touched) -> None:
+        if self.backend is None:
+            return
+        with self._lock:
+            self._epoch += 1
+            dropped = self.backend.invalidate(touched)
+            self.invalidations += dropped
+        log.debug("🧩 ResultCache: invalidated=%s touched=%s", dropped, list(touched))
+
+    def clear(self) -> None:
+        if self.backend is None:
+            return
+        with self._lock:
+            self._epoch += 1
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend"      : RESULT_CACHE,
+            "entries"      : len(self.backend) if self.backend is not None else 0,
+            "max_entries"  : self.backend.max_entries if self.backend is not None else 0,
+            "ttl_seconds"  : self.ttl,
+            "hits"         : self.hits,
+            "misses"       : self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+def _make_backend():
+    if RESULT_CACHE == "off":
+        return None
+    if RESULT_CACHE == "redis":
+        return RedisBackend(RESULT_CACHE_URL, RESULT_CACHE_MAX_ENTRIES)
+    return MemoryBackend(RESULT_CACHE_MAX_ENTRIES)
+
+
+result_cache = ResultCache(_make_backend())
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    touched = session.info.pop(_TOUCHED, None)
+    if touched:
+        result_cache.invalidate(touched)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session: Session) -> None:
+    session.info.pop(_TOUCHED, None)
@@ -1,32 +1,318 @@
 from typing import List, Optional
-from datetime import datetime
-from ..schemas import BalancePoint
+from datetime import datetime, time, timedelta
+from ..enums import Granularity
+from ..models import DEFAULT_ACCOUNT_ID
+from ..schemas import BalancePoint, CashflowPoint, CategoryTotal, RollingPoint
 from ..storage.transactions_repo import TransactionRepository
+from ..storage.daily_balance_repo import DailyBalanceRepository
+from .result_cache import result_cache, make_scope
 from sqlmodel import Session
 import logging
 
 log = logging.getLogger("ofc.services.stats")
 
+# Approximate bucket widths, used to pick a granularity that fits max_points.
+BUCKET_SECONDS = {
+    Granularity.hour : 3600,
+    Granularity.day  : 86400,
+    Granularity.week : 7 * 86400,
+    Granularity.month: 30.44 * 86400,
+}
+
+
+def _add_days(day, days: int):
+    """`day + days`, saturating at date.min / date.max instead of overflowing."""
+    try:
+        return day + timedelta(days=days)
+    except OverflowError:
+        return type(day).min if days < 0 else type(day).max
+
 
 class StatsService:
-    def __init__(self, session: Session):
-        self.repo = TransactionRepository(session)
+    def __init__(self, session: Session, account_id: int = DEFAULT_ACCOUNT_ID):
+        self.account_id = account_id
+        self.repo = TransactionRepository(session, account_id)
+        self.rollup = DailyBalanceRepository(session, account_id)
+
+    def _fit_granularity(
+        self,
+        granularity: Granularity,
+        max_points: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> Granularity:
+        """Coarsest-needed granularity for `max_points`, up to month.
+
+        A span too long even for monthly buckets still returns month;
+        _merge_buckets() then brings the series down to `max_points`.
+        """
+        if granularity == Granularity.raw:
+            if self.repo.count_filtered(start=start, end=end) <= max_points:
+                return granularity
+        first, last = self.repo.time_span(start, end)
+        if first is None:
+            return granularity
+        span = (last - first).total_seconds()
+        for g, seconds in BUCKET_SECONDS.items():
+            if seconds < BUCKET_SECONDS.get(granularity, 0):
+                continue
+            if span / seconds + 1 <= max_points:
+                return g
+        return Granularity.month
+
+    @staticmethod
+    def _merge_buckets(points: List[BalancePoint], max_points: int) -> List[BalancePoint]:
+        """Merge runs of k adjacent buckets so at most `max_points` remain.
+
+        Each merged point starts at its first bucket and closes at its last
+        one; min / max (range=true) cover the whole run.
+        """
+        k = -(-len(points) // max_points)
+        merged = []
+        for i in range(0, len(points), k):
+            run = points[i : i + k]
+            lows = [p.min for p in run if p.min is not None]
+            highs = [p.max for p in run if p.max is not None]
+            merged.append(
+                BalancePoint.model_construct(
+                    date=run[0].date,
+                    balance=run[-1].balance,
+                    min=min(lows) if lows else None,
+                    max=max(highs) if highs else None,
+                )
+            )
+        return merged
+
+    @staticmethod
+    def _day_aligned(*bounds: Optional[datetime]) -> bool:
+        return all(b is None or b == datetime.combine(b.date(), time()) for b in bounds)
 
     def balance_over_time(
         self,
         start: Optional[datetime] = None,
         end: Optional[datetime] = None,
-        #            txs_repo: TransactionRepository = D,
+        granularity: Granularity = Granularity.raw,
+        max_points: Optional[int] = None,
+        with_range: bool = False,
     ) -> List[BalancePoint]:
-        log.info("🧩 Service: stats balance_over_time start=%s end=%s", start, end)
-        txs = self.repo.list_filtered(start, end)
-        balance = 0.0
-        points: List[BalancePoint] = []
-        for t in txs:
-            balance += t.amount
-            points.append(BalancePoint(date=t.occurred_at, balance=round(balance, 2)))
+        log.debug(
+            "🧩 Service: stats balance_over_time start=%s end=%s granularity=%s max_points=%s",
+            start,
+            end,
+            granularity,
+            max_points,
+        )
+        key = result_cache.key(
+            "stats.balance_over_time",
+            account=self.account_id,
+            start=start,
+            end=end,
+            granularity=granularity,
+            max_points=max_points,
+            range=with_range,
+        )
+        # Balances are cumulative: any write up to `end` moves every point.
+        return result_cache.get_or_compute(
+            key,
+            make_scope(self.account_id, end=end),
+            lambda: self._balance_over_time(start, end, granularity, max_points, with_range),
+        )
+
+    def _balance_over_time(
+        self,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        granularity: Granularity,
+        max_points: Optional[int],
+        with_range: bool,
+    ) -> List[BalancePoint]:
+        if max_points:
+            granularity = self._fit_granularity(granularity, max_points, start, end)
+        if (
+            granularity in (Granularity.day, Granularity.week, Granularity.month)
+            and not with_range
+            and self._day_aligned(start, end)
+        ):
+            # Whole days only: read the DailyBalance rollup instead of the ledger.
+            start_day = start.date() if start else None
+            opening = self.rollup.sum_before(start_day) if start_day else 0.0
+            rows = self.rollup.bucketed_balance(
+                granularity,
+                start=start_day,
+                end=end.date() if end else None,
+                opening=opening,
+            )
+            points: List[BalancePoint] = [
+                BalancePoint.model_construct(date=d, balance=b) for d, b in rows
+            ]
+        elif granularity == Granularity.raw:
+            opening = self.repo.sum_before(start) if start else 0.0
+            rows = self.repo.running_balance(start=start, end=end, opening=opening)
+            points = [
+                BalancePoint.model_construct(date=d, balance=b) for d, b in rows
+            ]
+        else:
+            opening = self.repo.sum_before(start) if start else 0.0
+            rows = self.repo.bucketed_balance(
+                granularity, start=start, end=end, opening=opening
+            )
+            points = [
+                BalancePoint.model_construct(
+                    date=d,
+                    balance=close,
+                    min=lo if with_range else None,
+                    max=hi if with_range else None,
+                )
+                for d, close, lo, hi in rows
+            ]
         if not points:
-            from datetime import datetime as _dt
+            points.append(
+                BalancePoint(date=start or datetime.utcnow(), balance=round(opening, 2))
+            )
+        if max_points and len(points) > max_points:
+            points = self._merge_buckets(points, max_points)
+        return points
 
-            points.append(BalancePoint(date=_dt.utcnow(), balance=0.0))
+    def by_category(
+        self,
+        txn_type: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[CategoryTotal]:
+        log.debug("🧩 Service: stats by_category type=%s start=%s end=%s", txn_type, start, end)
+        key = result_cache.key(
+            "stats.by_category", account=self.account_id, type=txn_type, start=start, end=end
+        )
+        return result_cache.get_or_compute(
+            key,
+            make_scope(self.account_id, None, start, end),
+            lambda: [
+                CategoryTotal.model_construct(
+                    category=c, credits=cr, debits=db, net=net, count=n
+                )
+                for c, cr, db, net, n in self.repo.category_totals(txn_type, start, end)
+            ],
+        )
+
+    def cashflow(
+        self,
+        period: Granularity = Granularity.month,
+        category: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[CashflowPoint]:
+        log.debug(
+            "🧩 Service: stats cashflow period=%s category=%s start=%s end=%s",
+            period,
+            category,
+            start,
+            end,
+        )
+        if period == Granularity.raw:
+            raise ValueError("period must be hour, day, week or month")
+        key = result_cache.key(
+            "stats.cashflow",
+            account=self.account_id,
+            period=period,
+            category=category,
+            start=start,
+            end=end,
+        )
+        return result_cache.get_or_compute(
+            key,
+            make_scope(self.account_id, category, start, end),
+            lambda: [
+                CashflowPoint.model_construct(
+                    period=b, credits=cr, debits=db, net=net, count=n
+                )
+                for b, cr, db, net, n in self.repo.cashflow(period, category, start, end)
+            ],
+        )
+
+    def rolling(
+        self,
+        window_days: int = 30,
+        category: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[RollingPoint]:
+        """Trailing `window_days` spend / income for every day in [start, end).
+
+        SQL sums each day once (GROUP BY); the window then slides over the
+        dense daily series in O(days), adding the day entering the window and
+        subtracting the one leaving it. The series is clamped to the days
+        whose window can hold a row, so an open-ended or far-reaching range
+        costs no more than the data it covers.
+        """
+        log.debug(
+            "🧩 Service: stats rolling window=%sd category=%s start=%s end=%s",
+            window_days,
+            category,
+            start,
+            end,
+        )
+        key = result_cache.key(
+            "stats.rolling",
+            account=self.account_id,
+            window=window_days,
+            category=category,
+            start=start,
+            end=end,
+        )
+        # The SQL reads whole days, so the scope must cover the first lead-in
+        # day from midnight, not from start's time of day.
+        lead_in = (
+            datetime.combine(_add_days(start.date(), -(window_days - 1)), time())
+            if start
+            else None
+        )
+        return result_cache.get_or_compute(
+            key,
+            make_scope(self.account_id, category, lead_in, end),
+            lambda: self._rolling(window_days, category, start, end, lead_in),
+        )
+
+    def _rolling(
+        self,
+        window_days: int,
+        category: Optional[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        lead_in: Optional[datetime],
+    ) -> List[RollingPoint]:
+        daily = {
+            d.date(): (cr, db)
+            for d, cr, db, _, _ in self.repo.cashflow(Granularity.day, category, lead_in, end)
+        }
+        if not daily:
+            return []
+        # Windows ending before the first row, or window_days or more days
+        # after the last one, are empty: emit no points for them.
+        first = max(start.date(), min(daily)) if start else min(daily)
+        last = _add_days(max(daily), window_days - 1)
+        if end:
+            last = min(last, (end - timedelta(microseconds=1)).date())
+        day0 = _add_days(first, -(window_days - 1))
+        spend = income = 0.0
+        points: List[RollingPoint] = []
+        for i in range((last - day0).days + 1):
+            day = day0 + timedelta(days=i)
+            cr, db = daily.get(day, (0.0, 0.0))
+            income += cr
+            spend += db
+            # daily holds nothing before day0, so nothing leaves until then.
+            if i >= window_days:
+                cr, db = daily.get(day - timedelta(days=window_days), (0.0, 0.0))
+                income -= cr
+                spend -= db
+            if day >= first:
+                points.append(
+                    RollingPoint.model_construct(
+                        date=datetime.combine(day, time()),
+                        spend=round(spend, 2),
+                        income=round(income, 2),
+                        net=round(income - spend, 2),
+                        avg_daily_spend=round(spend / window_days, 2),
+                    )
+                )
         return points
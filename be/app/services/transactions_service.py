@@ -1,49 +1,218 @@
-from typing import Optional, List, Tuple
-from datetime import datetime
+from typing import Optional, List, Tuple, Dict, Any, Iterable, Union
+from datetime import datetime, date
+import base64
+import hashlib
+from pydantic import ValidationError
 from sqlmodel import Session
 
 from ..database import get_session
-from ..models import Transaction
+from ..enums import ListOrder
+from ..models import Transaction, DEFAULT_ACCOUNT_ID
 from ..schemas import TransactionCreate
 from ..storage.transactions_repo import TransactionRepository
+from ..storage.daily_balance_repo import DailyBalanceRepository
 from .categories_service import CategoryService
+from .data_version import data_version
+from .result_cache import result_cache, make_scope
 import logging
 
 log = logging.getLogger("ofc.services.transactions")
 
 
+def encode_cursor(occurred_at: datetime, tx_id: int) -> str:
+    """Opaque keyset cursor for the position right after (occurred_at, id)."""
+    raw = f"{occurred_at.isoformat()}|{tx_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, tx_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(ts), int(tx_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: [{cursor}]")
+
+
+def content_hash(occurred_at: datetime, amount: float, description: str) -> str:
+    """Identity of a ledger row, used to de-duplicate statement imports."""
+    return content_hash_iso(occurred_at.isoformat(), amount, description)
+
+
+def content_hash_iso(occurred_at: str, amount: float, description: str) -> str:
+    """content_hash() for an already formatted `occurred_at.isoformat()` (bulk seeding)."""
+    key = f"{occurred_at}|{amount:.2f}|{(description or '').strip().lower()}"
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def describe_validation_error(e: ValidationError) -> str:
+    """One-line `field: message; ...` summary of a pydantic error."""
+    return "; ".join(
+        f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+    )
+
+
 class TransactionService:
-    def __init__(self, session: Session):
+    """Ledger operations on one account (categories are shared by all accounts)."""
+
+    def __init__(self, session: Session, account_id: int = DEFAULT_ACCOUNT_ID):
         self.session = session
-        self.repo = TransactionRepository(session)
+        self.account_id = account_id
+        self.repo = TransactionRepository(session, account_id)
+        self.rollup = DailyBalanceRepository(session, account_id)
         self.categories = CategoryService(session)
 
     def _normalize_type(self, t: str) -> str:
         t_norm = (t or "").strip().lower()
         if t_norm not in ("credit", "debit"):
-            log.error(f"Invalid transaction type: {t}")
+            log.warning("Invalid transaction type: %s", t)
             raise ValueError(f"Invalid transaction trx_type: [{t}] ")
         return t_norm
 
-    def create(self, payload: TransactionCreate) -> Transaction:
-        log.error(
-            f"$$$$$$$$$$$$$$ Service: create called payload=[{payload.model_dump()}"
-        )
+    def to_row(
+        self,
+        payload: TransactionCreate,
+        created_at: Optional[datetime] = None,
+        account_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Column values for `payload` in this (or `account_id`'s) account: normalized type, signed amount."""
         t_type = self._normalize_type(payload.txn_type)
-        if payload.category and payload.category.strip():
-            self.categories.create_if_missing(payload.category.strip())
         amount = payload.amount if t_type == "credit" else -abs(payload.amount)
-        tx = Transaction(
-            amount=amount,
-            txn_type=t_type,
-            description=payload.description,
-            category=payload.category.strip() if payload.category else None,
-            occurred_at=payload.occurred_at,
-        )
+        return {
+            "account_id"  : account_id or self.account_id,
+            "amount"      : amount,
+            "txn_type"    : t_type,
+            "description" : payload.description,
+            "category"    : payload.category.strip() if payload.category else None,
+            "occurred_at" : payload.occurred_at,
+            "created_at"  : created_at or datetime.utcnow(),
+            "content_hash": content_hash(payload.occurred_at, amount, payload.description),
+        }
+
+    def create(self, payload: TransactionCreate) -> Transaction:
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("🧩 Service: create called payload=%s", payload.model_dump())
+        row = self.to_row(payload)
+        if row["category"]:
+            self.categories.create_if_missing(row["category"])
+        tx = Transaction(**row)
+        # Rollup is staged in the same session transaction; add() commits both.
+        self.rollup.apply(tx.occurred_at.date(), tx.amount, 1)
+        data_version.touch(self.session, self.account_id)
+        result_cache.touch(self.session, [(self.account_id, tx.category, tx.occurred_at)])
         created = self.repo.add(tx)
-        log.info("🧩 Service: transaction created -> %s", created.model_dump())
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("🧩 Service: transaction created -> %s", created.model_dump())
         return created
 
+    def create_many(
+        self, items: Iterable[Tuple[int, Any]]
+    ) -> Tuple[int, List[Tuple[int, str]]]:
+        """Validate and insert one batch of raw items in a single commit.
+
+        `items` are (index, raw dict) pairs; invalid items are skipped and
+        reported as (index, error) without aborting the rest of the batch.
+        Categories are upserted in one statement and rows go through one
+        executemany, so the whole batch costs a single fsync.
+        """
+        now = datetime.utcnow()
+        rows: List[Dict[str, Any]] = []
+        errors: List[Tuple[int, str]] = []
+        deltas: Dict[date, Tuple[float, int]] = {}
+        for index, raw in items:
+            try:
+                payload = (
+                    raw
+                    if isinstance(raw, TransactionCreate)
+                    else TransactionCreate.model_validate(raw)
+                )
+                row = self.to_row(payload, created_at=now)
+            except ValidationError as e:
+                errors.append((index, describe_validation_error(e)))
+                continue
+            except ValueError as e:
+                errors.append((index, str(e)))
+                continue
+            rows.append(row)
+            day = row["occurred_at"].date()
+            net, n = deltas.get(day, (0.0, 0))
+            deltas[day] = (net + row["amount"], n + 1)
+
+        if rows:
+            self.categories.ensure_many(r["category"] for r in rows if r["category"])
+            self.repo.insert_many(rows)
+            self.rollup.apply_many(deltas)
+            data_version.touch(self.session, self.account_id)
+            result_cache.touch(
+                self.session, ((self.account_id, r["category"], r["occurred_at"]) for r in rows)
+            )
+            self.session.commit()
+        log.info("🧩 Service: create_many inserted=%s failed=%s", len(rows), len(errors))
+        return len(rows), errors
+
+    def create_batch(
+        self,
+        payloads: List[TransactionCreate],
+        account_ids: Optional[List[int]] = None,
+    ) -> List[Union[Transaction, Exception]]:
+        """Insert concurrent single creates in one transaction (group commit).
+
+        `account_ids`, one per payload, lets creates for different accounts
+        share the commit; by default every row goes to this service's account.
+        Returns one entry per payload, in order: the created Transaction, with
+        the id taken from INSERT ... RETURNING rather than a refresh, or the
+        ValueError that rejected it.
+        """
+        now = datetime.utcnow()
+        accounts = account_ids or [self.account_id] * len(payloads)
+        results: List[Union[Transaction, Exception]] = []
+        rows: List[Dict[str, Any]] = []
+        deltas: Dict[int, Dict[date, Tuple[float, int]]] = {}
+        for payload, account_id in zip(payloads, accounts):
+            try:
+                row = self.to_row(payload, created_at=now, account_id=account_id)
+            except ValueError as e:
+                results.append(e)
+                continue
+            results.append(None)
+            rows.append(row)
+            day = row["occurred_at"].date()
+            by_day = deltas.setdefault(account_id, {})
+            net, n = by_day.get(day, (0.0, 0))
+            by_day[day] = (net + row["amount"], n + 1)
+
+        if rows:
+            self.categories.ensure_many(r["category"] for r in rows if r["category"])
+            ids = self.repo.insert_returning_ids(rows)
+            for account_id, by_day in deltas.items():
+                DailyBalanceRepository(self.session, account_id).apply_many(by_day)
+                data_version.touch(self.session, account_id)
+            result_cache.touch(
+                self.session, ((r["account_id"], r["category"], r["occurred_at"]) for r in rows)
+            )
+            self.session.commit()
+            created = iter(Transaction(id=i, **r) for i, r in zip(ids, rows))
+            results = [r if r is not None else next(created) for r in results]
+        log.debug(
+            "🧩 Service: create_batch inserted=%s failed=%s",
+            len(rows),
+            len(payloads) - len(rows),
+        )
+        return results
+
+    def backfill_content_hashes(self, batch: int = 5000) -> int:
+        """Hash rows written before content_hash existed; returns rows updated."""
+        done = last_id = 0
+        while True:
+            rows = self.repo.missing_hashes(batch, after_id=last_id)
+            if not rows:
+                return done
+            self.repo.set_hashes([(i, content_hash(at, amt, d)) for i, at, amt, d in rows])
+            self.session.commit()
+            done += len(rows)
+            last_id = rows[-1][0]
+            log.info("🧩 Service: content hashes backfilled=%s", done)
+
     def list(
         self,
         category: Optional[str] = None,
@@ -52,32 +221,90 @@ class TransactionService:
         end: Optional[datetime] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> Tuple[List[Transaction], int]:
+        with_total: bool = True,
+        cursor: Optional[str] = None,
+        search: Optional[str] = None,
+        order: ListOrder = ListOrder.time,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+        """One page of transactions plus the optional total and next cursor.
+
+        Items are plain TransactionRead-shaped dicts read as column tuples
+        (no ORM objects), ready to be encoded as-is. When `cursor` is given the
+        page starts right after it and `offset` is ignored. `search` filters on
+        the description full-text index; relevance-ordered pages are paged by
+        offset and carry no cursor.
+        """
         try:
             if type_:
                 type_ = self._normalize_type(type_)
-            log.info(
-                "🧩 Service: list called category=%s type=%s start=%s end=%s limit=%s offset=%s",
+            log.debug(
+                "🧩 Service: list called category=%s type=%s start=%s end=%s limit=%s offset=%s total=%s cursor=%s q=%s order=%s",
                 category,
                 type_,
                 start,
                 end,
                 limit,
                 offset,
+                with_total,
+                cursor,
+                search,
+                order,
+            )
+            after = decode_cursor(cursor) if cursor else None
+
+            def query():
+                rows = self.repo.list_rows(
+                    category,
+                    type_,
+                    start,
+                    end,
+                    limit=limit + 1,
+                    offset=0 if after else offset,
+                    after=after,
+                    search=search,
+                    order=order,
+                )
+                has_more = len(rows) > limit
+                columns = self.repo.EXPORT_COLUMNS
+                items = [dict(zip(columns, r)) for r in rows[:limit]]
+                last = items[-1] if has_more and order == ListOrder.time else None
+                next_cursor = encode_cursor(last["occurred_at"], last["id"]) if last else None
+                total = (
+                    self.repo.count_filtered(category, type_, start, end, search)
+                    if with_total
+                    else None
+                )
+                return items, total, next_cursor
+
+            key = result_cache.key(
+                "transactions.list",
+                account=self.account_id,
+                category=category,
+                type=type_,
+                start=start,
+                end=end,
+                limit=limit,
+                offset=offset,
+                total=with_total,
+                cursor=cursor,
+                q=search,
+                order=order,
+            )
+            return result_cache.get_or_compute(
+                key, make_scope(self.account_id, category, start, end), query
             )
-            all_items = self.repo.list_filtered(category, type_, start, end)
-            total = len(all_items)
-            items = all_items[offset : offset + limit]
-            return items, total
 
         except Exception as e:
             log.error("<UNK>  list_transactions exception=%s", e)
             raise e
 
     def delete(self, tx_id: int) -> bool:
-        log.info("🧩 Service: delete called id=%s", tx_id)
+        log.debug("🧩 Service: delete called id=%s", tx_id)
         tx = self.repo.get(tx_id)
         if not tx:
             return False
+        self.rollup.apply(tx.occurred_at.date(), -tx.amount, -1)
+        data_version.touch(self.session, self.account_id)
+        result_cache.touch(self.session, [(self.account_id, tx.category, tx.occurred_at)])
         self.repo.delete(tx)
         return True
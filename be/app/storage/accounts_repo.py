@@ -0,0 +1,15 @@
+from typing import Optional, List
+from sqlmodel import Session, select
+from .base import BaseRepository
+from ..models import Account
+
+
+class AccountRepository(BaseRepository[Account]):
+    def __init__(self, session: Session):
+        super().__init__(session, Account)
+
+    def get_by_name(self, name: str) -> Optional[Account]:
+        return self.session.exec(select(Account).where(Account.name == name)).first()
+
+    def list(self) -> List[Account]:
+        return self.session.exec(select(Account).order_by(Account.id)).all()
@@ -1,9 +1,48 @@
 from typing import Generic, TypeVar, Type, Optional
-from sqlmodel import SQLModel, Session
+from sqlmodel import SQLModel, Session, func
+from sqlalchemy import Float, Numeric, cast
+from sqlalchemy.sql.expression import UnaryExpression
+from sqlalchemy.sql.operators import custom_op
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.enums import Granularity
 
 T = TypeVar("T", bound=SQLModel)
 
 
+def time_bucket(session: Session, granularity: Granularity, col):
+    """SQL expression truncating a date/datetime column to its bucket start."""
+    if session.get_bind().dialect.name == "postgresql":
+        return func.date_trunc(granularity.value, col)
+    if granularity == Granularity.hour:
+        return func.strftime("%Y-%m-%d %H:00:00", col)
+    if granularity == Granularity.day:
+        return func.strftime("%Y-%m-%d 00:00:00", col)
+    if granularity == Granularity.week:
+        # ISO weeks start on Monday: jump to Sunday, then back six days.
+        return func.datetime(col, "start of day", "weekday 0", "-6 days")
+    return func.strftime("%Y-%m-01 00:00:00", col)
+
+
+def round_money(session: Session, expr):
+    """ROUND(expr, 2); Postgres only rounds NUMERIC, so cast there and back."""
+    if session.get_bind().dialect.name == "postgresql":
+        return cast(func.round(cast(expr, Numeric), 2), Float)
+    return func.round(expr, 2)
+
+
+def unindexed(col):
+    """`+col`: same value, but SQLite will not pick an index on `col` for the term."""
+    return UnaryExpression(col, operator=custom_op("+"), type_=col.type)
+
+
+def upsert_insert(session: Session, model: Type[SQLModel]):
+    """Dialect INSERT construct that supports on_conflict_do_*()."""
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
 class BaseRepository(Generic[T]):
     def __init__(self, session: Session, model: Type[T]):
         self.session = session
@@ -1,6 +1,7 @@
-from typing import Optional, List
+from typing import Optional, List, Iterable
+from datetime import datetime
 from sqlmodel import Session, select
-from .base import BaseRepository
+from .base import BaseRepository, upsert_insert
 from ..models import Category
 
 
@@ -11,9 +12,26 @@ class CategoryRepository(BaseRepository[Category]):
     def get_by_name(self, name: str) -> Optional[Category]:
         return self.session.exec(select(Category).where(Category.name == name)).first()
 
+    def insert(self, category: Category) -> Category:
+        """INSERT `category` and fill in its id (flush, no commit)."""
+        self.session.add(category)
+        self.session.flush()
+        return category
+
     def list(self, starts_with: Optional[str] = None) -> List[Category]:
         q = select(Category)
         if starts_with:
             q = q.where(Category.name.ilike(f"{starts_with}%"))
         q = q.order_by(Category.name.asc())
         return self.session.exec(q).all()
+
+    def ensure_names(self, names: Iterable[str]) -> None:
+        """Insert any missing category names in one statement (no commit)."""
+        now = datetime.utcnow()
+        rows = [{"name": nm, "created_at": now} for nm in sorted(set(names))]
+        if not rows:
+            return
+        stmt = upsert_insert(self.session, Category).on_conflict_do_nothing(
+            index_elements=[Category.name]
+        )
+        self.session.exec(stmt, params=rows)
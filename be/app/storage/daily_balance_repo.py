@@ -0,0 +1,143 @@
+from typing import Optional, List, Tuple, Dict
+from datetime import date, datetime
+from sqlmodel import Session, select, func, delete, insert
+
+from .base import round_money, time_bucket, upsert_insert
+from ..enums import Granularity
+from ..models import DailyBalance, Transaction, DEFAULT_ACCOUNT_ID
+
+
+class DailyBalanceRepository:
+    """Maintains the DailyBalance rollup of one account.
+
+    apply() never commits: callers run it inside the same session transaction
+    as the ledger write so the rollup and the ledger change together.
+    rebuild() and mismatches() cover every account.
+    """
+
+    def __init__(self, session: Session, account_id: int = DEFAULT_ACCOUNT_ID):
+        self.session = session
+        self.account_id = account_id
+
+    def apply(self, day: date, amount: float, count: int) -> None:
+        self.apply_many({day: (amount, count)})
+
+    def apply_many(self, deltas: Dict[date, Tuple[float, int]]) -> None:
+        """Add (amount, count) deltas per day in one executemany upsert."""
+        if not deltas:
+            return
+        stmt = upsert_insert(self.session, DailyBalance)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyBalance.account_id, DailyBalance.day],
+            set_={
+                "net"      : DailyBalance.net + stmt.excluded.net,
+                "txn_count": DailyBalance.txn_count + stmt.excluded.txn_count,
+            },
+        )
+        self.session.exec(
+            stmt,
+            params=[
+                {"account_id": self.account_id, "day": d, "net": amount, "txn_count": n}
+                for d, (amount, n) in deltas.items()
+            ],
+        )
+        emptied = [d for d, (_, n) in deltas.items() if n < 0]
+        if emptied:
+            self.session.exec(
+                delete(DailyBalance).where(
+                    DailyBalance.account_id == self.account_id,
+                    DailyBalance.day.in_(emptied),
+                    DailyBalance.txn_count <= 0,
+                )
+            )
+
+    def _ledger_by_day(self):
+        day = func.date(Transaction.occurred_at)
+        return (
+            select(Transaction.account_id, day, func.sum(Transaction.amount), func.count())
+            .group_by(Transaction.account_id, day)
+            .order_by(Transaction.account_id, day)
+        )
+
+    def rebuild(self) -> int:
+        """Recompute the whole rollup from the ledger; returns days written."""
+        self.session.exec(delete(DailyBalance))
+        self.session.exec(
+            insert(DailyBalance).from_select(
+                ["account_id", "day", "net", "txn_count"], self._ledger_by_day()
+            )
+        )
+        self.session.commit()
+        return self.session.exec(select(func.count()).select_from(DailyBalance)).one()
+
+    def rebuild_if_empty(self) -> bool:
+        """Backfill a freshly created rollup table for an existing ledger."""
+        if self.session.exec(select(DailyBalance.day).limit(1)).first() is not None:
+            return False
+        if self.session.exec(select(Transaction.id).limit(1)).first() is None:
+            return False
+        self.rebuild()
+        return True
+
+    def mismatches(
+        self, tolerance: float = 0.005
+    ) -> List[Tuple[int, date, float, float, int, int]]:
+        """(account, day, rollup net, ledger net, rollup count, ledger count) per drifted day."""
+        rollup = {
+            (d.account_id, d.day): (d.net, d.txn_count)
+            for d in self.session.exec(select(DailyBalance)).all()
+        }
+        ledger = {
+            (a, date.fromisoformat(d) if isinstance(d, str) else d): (net, n)
+            for a, d, net, n in self.session.exec(self._ledger_by_day()).all()
+        }
+        out = []
+        for account, day in sorted(rollup.keys() | ledger.keys()):
+            r_net, r_n = rollup.get((account, day), (0.0, 0))
+            l_net, l_n = ledger.get((account, day), (0.0, 0))
+            if r_n != l_n or abs(r_net - l_net) > tolerance:
+                out.append((account, day, r_net, l_net, r_n, l_n))
+        return out
+
+    def balances(self) -> Dict[int, float]:
+        """Current balance of every account, summed from the rollup."""
+        q = select(
+            DailyBalance.account_id, round_money(self.session, func.sum(DailyBalance.net))
+        ).group_by(DailyBalance.account_id)
+        return dict(self.session.exec(q).all())
+
+    def sum_before(self, day: date) -> float:
+        q = select(func.coalesce(func.sum(DailyBalance.net), 0.0)).where(
+            DailyBalance.account_id == self.account_id, DailyBalance.day < day
+        )
+        return float(self.session.exec(q).one())
+
+    def bucketed_balance(
+        self,
+        granularity: Granularity,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        opening: float = 0.0,
+    ) -> List[Tuple[datetime, float]]:
+        """(bucket start, closing balance) read from O(days) rollup rows."""
+        bucket = time_bucket(self.session, granularity, DailyBalance.day).label(
+            "bucket"
+        )
+        q = select(bucket, func.sum(DailyBalance.net).label("net")).where(
+            DailyBalance.account_id == self.account_id
+        )
+        if start:
+            q = q.where(DailyBalance.day >= start)
+        if end:
+            q = q.where(DailyBalance.day < end)
+        inner = q.group_by(bucket).subquery()
+        closing = round_money(
+            self.session, opening + func.sum(inner.c.net).over(order_by=inner.c.bucket)
+        )
+        rows = self.session.exec(
+            select(inner.c.bucket, closing).order_by(inner.c.bucket)
+        ).all()
+        return [
+            (datetime.fromisoformat(b) if isinstance(b, str) else b, bal)
+            for b, bal in rows
+        ]
@@ -0,0 +1,38 @@
+from typing import Iterable, Tuple
+from sqlmodel import Session, select
+
+from .base import upsert_insert
+from ..models import DataRevision, SHARED_REVISION
+
+
+class DataRevisionRepository:
+    """Per-account change counters shared by every process on the database.
+
+    bump() never commits: callers run it inside the writing transaction, so
+    the counter moves exactly when the change becomes visible.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def bump(self, account_ids: Iterable[int]) -> None:
+        """Add one to each account's counter, creating missing rows at 1."""
+        stmt = upsert_insert(self.session, DataRevision)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DataRevision.account_id],
+            set_={"version": DataRevision.version + 1},
+        )
+        self.session.exec(
+            stmt, params=[{"account_id": a, "version": 1} for a in sorted(set(account_ids))]
+        )
+
+    def versions(self, account_id: int) -> Tuple[int, int]:
+        """(shared, account_id's) counters; 0 for a counter never bumped."""
+        rows = dict(
+            self.session.exec(
+                select(DataRevision.account_id, DataRevision.version).where(
+                    DataRevision.account_id.in_({SHARED_REVISION, account_id})
+                )
+            ).all()
+        )
+        return rows.get(SHARED_REVISION, 0), rows.get(account_id, 0)
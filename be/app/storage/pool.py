@@ -0,0 +1,75 @@
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """Cumulative checkout counters for one pool (reset when the pool is recreated)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class TimedPoolMixin:
+    """Times every checkout from the pool's queue, including connection setup."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.observe(time.perf_counter() - started)
+        return conn
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_snapshot(engine) -> Dict[str, Any]:
+    """Current occupancy plus cumulative checkout stats for `engine`'s pool."""
+    pool = engine.pool
+    snapshot: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        snapshot.update(
+            size=pool.size(),
+            in_use=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        snapshot.update(
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            wait_seconds_total=round(stats.wait_seconds_total, 6),
+            wait_seconds_max=round(stats.wait_seconds_max, 6),
+        )
+    return snapshot
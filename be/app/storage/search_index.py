@@ -0,0 +1,161 @@
+"""
+Full-text index over Transaction.description.
+
+SQLite: an external-content FTS5 table (`transaction_fts`, rowid = transaction
+id) that stores only the index, kept in step with the ledger by AFTER INSERT /
+DELETE / UPDATE triggers, so every write path (ORM, Core executemany, the
+seeder, imports, the writer thread) updates it in the same transaction.
+Postgres: a GIN expression index on to_tsvector('simple', description),
+maintained by the server.
+
+Search text is split into word terms; every term must match and the last one
+also matches as a prefix ("gro" finds "Grocery run").
+"""
+
+import logging
+import re
+from typing import List, Optional
+
+from sqlalchemy import column, func, literal_column, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DatabaseError, OperationalError
+
+from app.models import Transaction
+
+log = logging.getLogger("ofc.storage.search_index")
+
+FTS_TABLE = "transaction_fts"
+PG_INDEX = "ix_transaction_description_fts"
+MAX_TERMS = 16
+
+fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+# (trigger name, body) on the "transaction" table; 'delete' is FTS5's command
+# for removing the old tokens of an external-content row.
+_TRIGGERS = {
+    "transaction_fts_ai": (
+        'AFTER INSERT ON "transaction" BEGIN '
+        f"INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description); END"
+    ),
+    "transaction_fts_ad": (
+        'AFTER DELETE ON "transaction" BEGIN '
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) "
+        "VALUES ('delete', old.id, old.description); END"
+    ),
+    "transaction_fts_au": (
+        'AFTER UPDATE OF description ON "transaction" BEGIN '
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) "
+        "VALUES ('delete', old.id, old.description); "
+        f"INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description); END"
+    ),
+}
+
+# False once SQLite turned out to lack FTS5; search then falls back to LIKE.
+fts_available = True
+
+
+def search_terms(q: Optional[str]) -> List[str]:
+    """Lower-cased word terms of a search string (punctuation dropped)."""
+    terms = re.findall(r"\w+", (q or "").lower())
+    if not terms:
+        raise ValueError(f"Search query has no words: [{q}]")
+    return terms[:MAX_TERMS]
+
+
+def fts5_query(terms: List[str]) -> str:
+    """FTS5 MATCH string: all terms, quoted, the last one as a prefix."""
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def tsquery(terms: List[str]) -> str:
+    """to_tsquery() string: all terms, the last one as a prefix."""
+    return " & ".join(terms[:-1] + [terms[-1] + ":*"])
+
+
+def pg_document():
+    # Must stay textually identical to the PG_INDEX expression to use it.
+    return func.to_tsvector(literal_column("'simple'"), Transaction.description)
+
+
+def pg_query(terms: List[str]):
+    return func.to_tsquery(literal_column("'simple'"), tsquery(terms))
+
+
+def fts5_match(terms: List[str]):
+    return literal_column(FTS_TABLE).op("MATCH")(fts5_query(terms))
+
+
+def ensure(conn: Connection) -> bool:
+    """Create the index (and its triggers) if missing; True if it was (re)built.
+
+    A missing trigger means the index may have missed writes (new database,
+    tables dropped and recreated, a bulk load that suspended it), so the
+    index is then rebuilt from the ledger.
+    """
+    global fts_available
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            text(
+                f'CREATE INDEX IF NOT EXISTS {PG_INDEX} ON "transaction" '
+                "USING gin (to_tsvector('simple', description))"
+            )
+        )
+        return False
+    if conn.dialect.name != "sqlite":
+        return False
+    try:
+        conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "description, content='transaction', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+    except OperationalError as e:
+        fts_available = False
+        log.warning("❌ SearchIndex: FTS5 unavailable, search falls back to LIKE (%s)", e.orig)
+        return False
+    existing = {
+        r[0]
+        for r in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'transaction'"
+        )
+    }
+    missing = [name for name in _TRIGGERS if name not in existing]
+    for name in missing:
+        conn.exec_driver_sql(f"CREATE TRIGGER {name} {_TRIGGERS[name]}")
+    if missing:
+        rebuild(conn)
+    return bool(missing)
+
+
+def suspend(conn: Connection) -> None:
+    """Drop the sync triggers for a bulk load; ensure() rebuilds afterwards."""
+    if conn.dialect.name == "sqlite" and fts_available:
+        for name in _TRIGGERS:
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def rebuild(conn: Connection) -> None:
+    """Re-index every ledger row."""
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"REINDEX INDEX {PG_INDEX}"))
+    elif conn.dialect.name == "sqlite" and fts_available:
+        conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        log.info("✅ SearchIndex: rebuilt %s", FTS_TABLE)
+
+
+def check(conn: Connection) -> Optional[str]:
+    """None if the index matches the ledger, else a description of the problem."""
+    if conn.dialect.name != "sqlite":
+        return None
+    if not fts_available:
+        return "FTS5 is not available in this SQLite build"
+    try:
+        # rank=1 also compares the index against the content table.
+        conn.exec_driver_sql(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('integrity-check', 1)"
+        )
+    except DatabaseError as e:  # SQLITE_CORRUPT_VTAB on a mismatch
+        return str(e.orig)
+    return None
@@ -1,39 +1,429 @@
-from typing import Optional, List, Sequence
+from typing import Optional, List, Sequence, Tuple, Dict, Any, Iterator
 from datetime import datetime
 from sqlmodel import Session as SqlSession
-from .base import BaseRepository
-from app.models import Transaction
+from .base import BaseRepository, round_money, time_bucket, unindexed
+from app.models import Transaction, DEFAULT_ACCOUNT_ID
+from app.enums import Granularity, ListOrder
+from . import search_index
 from typing import Optional
 from app.database import open_session
 
-from sqlmodel import Field, Session, SQLModel, create_engine, select
+from sqlmodel import Field, Session, SQLModel, create_engine, select, func, tuple_, case, update
+from sqlalchemy import DateTime, String, and_, bindparam, type_coerce
 
 from fastapi import FastAPI, Depends, HTTPException, status
 from app.database import get_session
 
 
 class TransactionRepository(BaseRepository[Transaction]):
-    def __init__(self, session: SqlSession):
+    """Ledger queries for one account; every read is filtered by account_id."""
+
+    def __init__(self, session: SqlSession, account_id: int = DEFAULT_ACCOUNT_ID):
         super().__init__(session, Transaction)
+        self.account_id = account_id
 
-    def list_filtered(
+    def get(self, pk: int) -> Optional[Transaction]:
+        tx = self.session.get(Transaction, pk)
+        return tx if tx is not None and tx.account_id == self.account_id else None
+
+    def insert_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert plain row dicts with a single executemany (no commit).
+
+        Goes through the Core table insert on the session's connection, which
+        skips the ORM bulk-persistence bookkeeping.
+        """
+        if rows:
+            self.session.connection().execute(Transaction.__table__.insert(), rows)
+
+    def insert_returning_ids(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert row dicts in one statement batch and return their ids, in order (no commit)."""
+        if not rows:
+            return []
+        table = Transaction.__table__
+        stmt = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+        return [r[0] for r in self.session.connection().execute(stmt, rows)]
+
+    def max_id(self) -> int:
+        """Highest id in the whole ledger (ids are shared by all accounts)."""
+        return self.session.exec(select(func.coalesce(func.max(Transaction.id), 0))).one()
+
+    def hash_counts(
+        self, hashes: List[str], max_id: Optional[int] = None
+    ) -> Dict[str, int]:
+        """How many rows carry each content hash (optionally only id <= max_id)."""
+        if not hashes:
+            return {}
+        q = (
+            select(Transaction.content_hash, func.count())
+            .where(
+                Transaction.account_id == self.account_id,
+                Transaction.content_hash.in_(hashes),
+            )
+            .group_by(Transaction.content_hash)
+        )
+        if max_id is not None:
+            q = q.where(Transaction.id <= max_id)
+        return dict(self.session.exec(q).all())
+
+    def missing_hashes(
+        self, limit: int, after_id: int = 0
+    ) -> List[Tuple[int, datetime, float, str]]:
+        """(id, occurred_at, amount, description) of rows without a content hash, any account.
+
+        Walks the primary key from `after_id`, so repeated batches do not
+        rescan rows already hashed.
+        """
+        q = (
+            select(
+                Transaction.id,
+                Transaction.occurred_at,
+                Transaction.amount,
+                Transaction.description,
+            )
+            .where(Transaction.id > after_id, Transaction.content_hash.is_(None))
+            .order_by(Transaction.id)
+            .limit(limit)
+        )
+        return [tuple(r) for r in self.session.exec(q).all()]
+
+    def set_hashes(self, pairs: List[Tuple[int, str]]) -> None:
+        """Set content_hash per (id, hash) with one executemany (no commit)."""
+        if pairs:
+            stmt = (
+                update(Transaction)
+                .where(Transaction.id == bindparam("tx_id"))
+                .values(content_hash=bindparam("digest"))
+            )
+            self.session.connection().execute(
+                stmt, [{"tx_id": i, "digest": h} for i, h in pairs]
+            )
+
+    def _apply_filters(
         self,
+        q,
         category: Optional[str] = None,
         txn_type: Optional[str] = None,
         start: Optional[datetime] = None,
         end: Optional[datetime] = None,
-    ) -> List[Transaction]:
-        q = select(Transaction)
+        indexed: bool = True,
+    ):
+        """Account and filter terms; `indexed=False` keeps the planner off their indexes."""
+        col = (lambda c: c) if indexed else unindexed
+        q = q.where(col(Transaction.account_id) == self.account_id)
         if category:
-            q = q.where(Transaction.category == category)
+            q = q.where(col(Transaction.category) == category)
         if txn_type:
-            q = q.where(Transaction.txn_type == txn_type)
+            q = q.where(col(Transaction.txn_type) == txn_type)
         if start:
-            q = q.where(Transaction.occurred_at >= start)
+            q = q.where(col(Transaction.occurred_at) >= start)
         if end:
-            q = q.where(Transaction.occurred_at < end)
-        q = q.order_by(Transaction.occurred_at)
+            q = q.where(col(Transaction.occurred_at) < end)
+        return q
+
+    def _fts_search(self, search: Optional[str]) -> bool:
+        """True if `search` is answered from the SQLite FTS5 table."""
+        return bool(search) and search_index.fts_available and (
+            self.session.get_bind().dialect.name == "sqlite"
+        )
+
+    def _apply_search(self, q, search: Optional[str], ranked: bool = False):
+        """Restrict to rows whose description matches `search` (see search_index).
+
+        `ranked` orders the matches best first (BM25 on SQLite, ts_rank on
+        Postgres) instead of leaving the order to the caller.
+        """
+        if not search:
+            if ranked:
+                raise ValueError("order=relevance needs a search query")
+            return q
+        terms = search_index.search_terms(search)
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            doc, query = search_index.pg_document(), search_index.pg_query(terms)
+            q = q.where(doc.op("@@")(query))
+            if ranked:
+                q = q.order_by(func.ts_rank(doc, query).desc(), Transaction.id)
+            return q
+        if dialect != "sqlite" or not search_index.fts_available:
+            likes = [Transaction.description.ilike(f"%{t}%") for t in terms]
+            q = q.where(and_(*likes))
+            return q.order_by(Transaction.id) if ranked else q
+        # Both forms read the match set from the index once, so cost follows the
+        # number of matches, not the table. A plain join would let the planner
+        # walk a filter index and re-run MATCH per row; `rowid + 0` rules that out,
+        # as do the unindexed filter terms the callers add (every index leads
+        # with account_id, so an indexed filter would otherwise always win).
+        fts = search_index.fts
+        match = search_index.fts5_match(terms)
+        if ranked:
+            q = q.join(fts, fts.c.rowid + 0 == Transaction.id).where(match)
+            return q.order_by(fts.c.rank, Transaction.id)
+        return q.where(Transaction.id.in_(select(fts.c.rowid).where(match)))
+
+    def list_filtered(
+        self,
+        category: Optional[str] = None,
+        txn_type: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[Tuple[datetime, int]] = None,
+        search: Optional[str] = None,
+        order: ListOrder = ListOrder.time,
+    ) -> List[Transaction]:
+        """Rows ordered by (occurred_at, id), or best match first for `order=relevance`.
+
+        `after` is a keyset position: only rows strictly after that
+        (occurred_at, id) pair are returned, so deep pages cost the same as
+        the first one. `search` keeps rows whose description matches it
+        through the full-text index.
+        """
+        q = self._page_query(
+            select(Transaction), category, txn_type, start, end, limit, offset, after,
+            search, order,
+        )
         r = self.session.exec(q)
         s: Sequence[Transaction] = r.all()
         l: List[Transaction] = list(s)
         return l
+
+    def list_rows(
+        self,
+        category: Optional[str] = None,
+        txn_type: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[Tuple[datetime, int]] = None,
+        search: Optional[str] = None,
+        order: ListOrder = ListOrder.time,
+    ) -> List[tuple]:
+        """list_filtered() as plain EXPORT_COLUMNS tuples, without ORM identity."""
+        cols = [getattr(Transaction, c) for c in self.EXPORT_COLUMNS]
+        q = self._page_query(
+            select(*cols), category, txn_type, start, end, limit, offset, after,
+            search, order,
+        )
+        return [tuple(r) for r in self.session.connection().execute(q)]
+
+    def _page_query(
+        self, q, category, txn_type, start, end, limit, offset, after,
+        search=None, order=ListOrder.time,
+    ):
+        q = self._apply_filters(
+            q, category, txn_type, start, end, indexed=not self._fts_search(search)
+        )
+        ranked = order == ListOrder.relevance
+        q = self._apply_search(q, search, ranked)
+        if after:
+            if ranked:
+                raise ValueError("cursor paging needs order=time; use offset")
+            q = q.where(tuple_(Transaction.occurred_at, Transaction.id) > tuple_(*after))
+        if not ranked:
+            q = q.order_by(Transaction.occurred_at, Transaction.id)
+        if offset:
+            q = q.offset(offset)
+        if limit is not None:
+            q = q.limit(limit)
+        return q
+
+    EXPORT_COLUMNS = (
+        "id",
+        "amount",
+        "txn_type",
+        "description",
+        "category",
+        "occurred_at",
+        "created_at",
+    )
+
+    def iter_filtered(
+        self,
+        category: Optional[str] = None,
+        txn_type: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        batch_size: int = 1000,
+        columns: Sequence[str] = EXPORT_COLUMNS,
+        raw_timestamps: bool = False,
+        by_id: bool = False,
+    ) -> Iterator[Sequence[tuple]]:
+        """Yield batches of `columns` tuples from a server-side cursor.
+
+        With `raw_timestamps` on SQLite, DateTime columns come back as their
+        stored "YYYY-MM-DD HH:MM:SS.ffffff" text instead of being parsed into
+        datetime objects row by row (columnar exports parse them in bulk).
+        `by_id` orders by id, a sequential table scan, instead of walking the
+        (occurred_at, id) index.
+        """
+        raw = raw_timestamps and self.session.get_bind().dialect.name == "sqlite"
+        cols = []
+        for name in columns:
+            col = getattr(Transaction, name)
+            if raw and isinstance(col.type, DateTime):
+                col = type_coerce(col, String).label(name)
+            cols.append(col)
+        q = self._apply_filters(select(*cols), category, txn_type, start, end)
+        q = q.order_by(Transaction.id) if by_id else q.order_by(Transaction.occurred_at, Transaction.id)
+        result = self.session.connection().execution_options(
+            stream_results=True, yield_per=batch_size
+        ).execute(q)
+        for batch in result.partitions(batch_size):
+            yield batch
+
+    def count_filtered(
+        self,
+        category: Optional[str] = None,
+        txn_type: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        search: Optional[str] = None,
+    ) -> int:
+        q = self._apply_filters(
+            select(func.count()).select_from(Transaction),
+            category,
+            txn_type,
+            start,
+            end,
+            indexed=not self._fts_search(search),
+        )
+        q = self._apply_search(q, search)
+        return self.session.exec(q).one()
+
+    def sum_before(self, start: datetime) -> float:
+        """Sum of all amounts strictly before `start` (the opening balance)."""
+        q = select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(
+            Transaction.account_id == self.account_id, Transaction.occurred_at < start
+        )
+        return float(self.session.exec(q).one())
+
+    def time_span(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """(first, last) occurred_at inside the window."""
+        q = self._apply_filters(
+            select(func.min(Transaction.occurred_at), func.max(Transaction.occurred_at)),
+            start=start,
+            end=end,
+        )
+        first, last = self.session.exec(q).one()
+        return first, last
+
+    def running_balance(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        opening: float = 0.0,
+    ) -> List[Tuple[datetime, float]]:
+        """(occurred_at, balance) per row, with the running sum done in SQL."""
+        balance = round_money(
+            self.session,
+            opening
+            + func.sum(Transaction.amount).over(
+                order_by=(Transaction.occurred_at, Transaction.id)
+            ),
+        )
+        q = self._apply_filters(
+            select(Transaction.occurred_at, balance), start=start, end=end
+        )
+        q = q.order_by(Transaction.occurred_at, Transaction.id)
+        return [tuple(r) for r in self.session.exec(q).all()]
+
+    def _flow_columns(self):
+        """credits, debits (as positive outflow), net and row count, rounded."""
+        credits = func.coalesce(
+            func.sum(case((Transaction.txn_type == "credit", Transaction.amount), else_=0.0)), 0.0
+        )
+        debits = func.coalesce(
+            func.sum(
+                case((Transaction.txn_type == "debit", func.abs(Transaction.amount)), else_=0.0)
+            ),
+            0.0,
+        )
+        return (
+            round_money(self.session, credits),
+            round_money(self.session, debits),
+            round_money(self.session, func.sum(Transaction.amount)),
+            func.count(),
+        )
+
+    def category_totals(
+        self,
+        txn_type: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Tuple[Optional[str], float, float, float, int]]:
+        """(category, credits, debits, net, count) per category, one GROUP BY."""
+        q = self._apply_filters(
+            select(Transaction.category, *self._flow_columns()),
+            txn_type=txn_type,
+            start=start,
+            end=end,
+        )
+        q = q.group_by(Transaction.category).order_by(Transaction.category)
+        return [tuple(r) for r in self.session.exec(q).all()]
+
+    def cashflow(
+        self,
+        granularity: Granularity,
+        category: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Tuple[datetime, float, float, float, int]]:
+        """(bucket start, credits, debits, net, count) per time bucket."""
+        bucket_expr = time_bucket(self.session, granularity, Transaction.occurred_at)
+        q = self._apply_filters(
+            select(bucket_expr.label("bucket"), *self._flow_columns()),
+            category=category,
+            start=start,
+            end=end,
+        )
+        q = q.group_by(bucket_expr).order_by(bucket_expr)
+        return [
+            (datetime.fromisoformat(b) if isinstance(b, str) else b, *rest)
+            for b, *rest in self.session.exec(q).all()
+        ]
+
+    def bucketed_balance(
+        self,
+        granularity: Granularity,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        opening: float = 0.0,
+    ) -> List[Tuple[datetime, float, float, float]]:
+        """(bucket start, closing, min, max) balance per time bucket.
+
+        The running sum is computed once per row in a window; the last row of
+        each bucket is the one whose successor falls in a different bucket, so
+        both windows share the (occurred_at, id) index order and need no sort.
+        """
+        order = (Transaction.occurred_at, Transaction.id)
+        bucket_expr = time_bucket(self.session, granularity, Transaction.occurred_at)
+        running = (opening + func.sum(Transaction.amount).over(order_by=order)).label(
+            "balance"
+        )
+        next_bucket = func.lead(bucket_expr).over(order_by=order).label("next_bucket")
+        inner = self._apply_filters(
+            select(bucket_expr.label("bucket"), running, next_bucket),
+            start=start,
+            end=end,
+        ).subquery()
+        is_last = (inner.c.next_bucket.is_(None)) | (
+            inner.c.next_bucket != inner.c.bucket
+        )
+        q = (
+            select(
+                inner.c.bucket,
+                round_money(self.session, func.max(case((is_last, inner.c.balance)))),
+                round_money(self.session, func.min(inner.c.balance)),
+                round_money(self.session, func.max(inner.c.balance)),
+            )
+            .group_by(inner.c.bucket)
+            .order_by(inner.c.bucket)
+        )
+        return [
+            (datetime.fromisoformat(b) if isinstance(b, str) else b, close, lo, hi)
+            for b, close, lo, hi in self.session.exec(q).all()
+        ]
@@ -0,0 +1,128 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+import logging
+
+log = logging.getLogger("ofc.storage.writer")
+
+T = TypeVar("T")
+Job = Tuple[Callable[[Session], Any], Future]
+
+
+class GroupCommitSession(Session):
+    """Session whose commit() only flushes while the writer holds a batch open.
+
+    Service code keeps calling commit() as usual; the writer thread issues the
+    real COMMIT once per batch. rollback() undoes only the current job's
+    savepoint so one failing job cannot discard its neighbours.
+    """
+
+    deferred = False
+
+    def commit(self) -> None:
+        if self.deferred:
+            self.flush()
+        else:
+            super().commit()
+
+    def rollback(self) -> None:
+        nested = self.get_nested_transaction() if self.deferred else None
+        if nested is not None:
+            if nested.is_active:
+                nested.rollback()
+        else:
+            super().rollback()
+
+
+class SqliteWriter:
+    """The single thread allowed to write to the SQLite database.
+
+    Jobs are callables taking a Session. Whatever is queued when the thread
+    wakes up (up to `max_batch`) runs in one transaction, each job inside its
+    own SAVEPOINT, and is committed together: concurrent writers share one
+    fsync instead of contending for the database lock.
+    """
+
+    def __init__(self, engine: Engine, max_batch: int = 256):
+        self.engine = engine
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._loop, name="sqlite-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def submit(self, job: Callable[[Session], T]) -> "Future[T]":
+        self._ensure_started()
+        fut: Future = Future()
+        self._queue.put((job, fut))
+        return fut
+
+    async def run(self, job: Callable[[Session], T]) -> T:
+        return await asyncio.wrap_future(self.submit(job))
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch: List[Job] = [job]
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._queue.put(None)
+                    break
+                batch.append(nxt)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Job]) -> None:
+        outcomes = []
+        with GroupCommitSession(self.engine, expire_on_commit=False) as session:
+            session.deferred = True
+            for fn, fut in batch:
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                savepoint = session.begin_nested()
+                try:
+                    result = fn(session)
+                    if savepoint.is_active:
+                        savepoint.commit()
+                    outcomes.append((fut, result, None))
+                except Exception as e:
+                    if savepoint.is_active:
+                        savepoint.rollback()
+                    outcomes.append((fut, None, e))
+            session.deferred = False
+            try:
+                session.commit()
+            except Exception as e:
+                log.error("writer: group commit failed jobs=%s error=%s", len(batch), e)
+                session.rollback()
+                outcomes = [(fut, None, err or e) for fut, _, err in outcomes]
+        log.debug("writer: committed jobs=%s", len(outcomes))
+        for fut, result, err in outcomes:
+            if err is not None:
+                fut.set_exception(err)
+            else:
+                fut.set_result(result)